@@ -4,6 +4,7 @@ Harmony Scheduler API Server
 Run with: python run_server.py
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -11,13 +12,25 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from api.main import app
 import uvicorn
 
 if __name__ == "__main__":
+    # Worker count is exported so each worker can size its solver pool
+    workers = int(os.environ.get("WEB_CONCURRENCY", min(8, os.cpu_count() or 1)))
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
     print("Starting Harmony Scheduler API...")
+    print(f"Workers: {workers}")
     print("API Documentation: http://localhost:8000/docs")
     print("Health Check: http://localhost:8000/health")
     print("\nPress CTRL+C to stop\n")
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Multiple workers require the app as an import string
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers
+    )
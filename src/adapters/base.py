@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, ClassVar, FrozenSet
 from ..models.cdm import ScheduleRequest
 
 
@@ -11,8 +11,14 @@ class ScheduleAdapter(ABC):
     Each client's data format is handled by a concrete adapter that
     implements the to_cdm() method. This keeps client-specific logic
     isolated from the core solver.
+
+    Adapters that set required_keys are auto-detected by the factory when
+    a payload contains all of those top-level keys; an empty set means the
+    client can only be selected by explicit client_id.
     """
 
+    required_keys: ClassVar[FrozenSet[str]] = frozenset()
+
     @abstractmethod
     def to_cdm(self, raw_input: Dict[str, Any]) -> ScheduleRequest:
         """
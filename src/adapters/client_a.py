@@ -1,8 +1,14 @@
 from typing import Dict, Any
+from pydantic import TypeAdapter
 from .base import ScheduleAdapter
 from ..models.cdm import ScheduleRequest
 
 
+# Validates the raw dict in one validate_python call, skipping the
+# ScheduleRequest(**raw_input) kwargs unpacking and __init__ path
+_SCHEDULE_REQUEST_ADAPTER = TypeAdapter(ScheduleRequest)
+
+
 class ClientAAdapter(ScheduleAdapter):
     """
     Adapter for Client A (original format).
@@ -11,6 +17,8 @@ class ClientAAdapter(ScheduleAdapter):
     so this adapter mostly just validates and passes through.
     """
 
+    required_keys = frozenset({"horizon", "products"})
+
     @property
     def client_id(self) -> str:
         return "client_a"
@@ -20,4 +28,4 @@ class ClientAAdapter(ScheduleAdapter):
         Client A format is already compatible with CDM.
         Just validate and construct the model.
         """
-        return ScheduleRequest(**raw_input)
+        return _SCHEDULE_REQUEST_ADAPTER.validate_python(raw_input)
@@ -1,11 +1,14 @@
 from typing import Dict, Any, List, Tuple
 from datetime import datetime
+from operator import itemgetter
 from .base import ScheduleAdapter
 from ..models.cdm import (
     ScheduleRequest, Horizon, Resource, Product, Operation,
     ChangeoverMatrix, Settings
 )
 
+_STEP = itemgetter("step")
+
 
 class ClientBAdapter(ScheduleAdapter):
     """
@@ -20,6 +23,8 @@ class ClientBAdapter(ScheduleAdapter):
     - Implicit calendars (full shift unless break specified)
     """
 
+    required_keys = frozenset({"shift_window", "orders"})
+
     @property
     def client_id(self) -> str:
         return "client_b"
@@ -72,12 +77,19 @@ class ClientBAdapter(ScheduleAdapter):
         start_str = parts[0].strip()
         end_time_str = parts[1].strip()
 
-        # Parse start datetime
-        start_dt = datetime.strptime(start_str, "%m/%d/%Y %H:%M")
+        # Parse start datetime; zero-padded "MM/DD/YYYY HH:MM" is sliced
+        # directly, anything else goes through strptime
+        s = start_str
+        if len(s) == 16 and s[2] == "/" and s[5] == "/" and s[13] == ":":
+            start_dt = datetime(
+                int(s[6:10]), int(s[0:2]), int(s[3:5]),
+                int(s[11:13]), int(s[14:16])
+            )
+        else:
+            start_dt = datetime.strptime(start_str, "%m/%d/%Y %H:%M")
 
         # End is just time, use same date as start
-        end_hour, end_min = map(int, end_time_str.split(":"))
-        end_dt = start_dt.replace(hour=end_hour, minute=end_min)
+        end_dt = self._parse_time(end_time_str, start_dt)
 
         return Horizon(start=start_dt, end=end_dt)
 
@@ -161,6 +173,11 @@ class ClientBAdapter(ScheduleAdapter):
 
     def _parse_time(self, time_str: str, base_date: datetime) -> datetime:
         """Parse time like '12:00' using base date."""
+        if len(time_str) == 5 and time_str[2] == ":":
+            return base_date.replace(
+                hour=int(time_str[0:2]),
+                minute=int(time_str[3:5])
+            )
         hour, minute = map(int, time_str.split(":"))
         return base_date.replace(hour=hour, minute=minute)
 
@@ -173,20 +190,16 @@ class ClientBAdapter(ScheduleAdapter):
         products = []
 
         for order in orders:
-            # Parse due time (decimal hour like 15.0 = 3pm)
-            due_hour = order["deadline_hour"]
-            due_dt = base_date.replace(
-                hour=int(due_hour),
-                minute=int((due_hour % 1) * 60)
-            )
+            # Parse due time (decimal hour like 15.0 = 3pm), floored to whole
+            # minutes; the epsilon absorbs float error (16.9 * 60 = 1013.99...)
+            due_hour, due_min = divmod(int(order["deadline_hour"] * 60 + 1e-6), 60)
+            due_dt = base_date.replace(hour=due_hour, minute=due_min)
 
             # Build route from operations
-            route = []
-            for op in sorted(order["operations"], key=lambda x: x["step"]):
-                route.append(Operation(
-                    capability=op["type"],
-                    duration_minutes=op["minutes"]
-                ))
+            route = [
+                Operation(capability=op["type"], duration_minutes=op["minutes"])
+                for op in sorted(order["operations"], key=_STEP)
+            ]
 
             products.append(Product(
                 id=order["order_id"],
@@ -202,14 +215,9 @@ class ClientBAdapter(ScheduleAdapter):
         setup_times: List[Dict[str, Any]]
     ) -> ChangeoverMatrix:
         """Convert setup_times list to changeover matrix."""
-        values = {}
-
-        for setup in setup_times:
-            from_family = setup["from_family"]
-            to_family = setup["to_family"]
-            minutes = setup["minutes"]
-
-            key = f"{from_family}->{to_family}"
-            values[key] = minutes
+        values = {
+            f"{setup['from_family']}->{setup['to_family']}": setup["minutes"]
+            for setup in setup_times
+        }
 
         return ChangeoverMatrix(values=values)
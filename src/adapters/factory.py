@@ -4,6 +4,12 @@ from .client_a import ClientAAdapter
 from .client_b import ClientBAdapter
 
 
+_UNDETECTED_FORMAT = (
+    "Unable to detect client format. "
+    "Ensure input has either (horizon + products) or (shift_window + orders)"
+)
+
+
 class AdapterFactory:
     """
     Factory for selecting the appropriate adapter based on input format.
@@ -14,10 +20,24 @@ class AdapterFactory:
     """
 
     def __init__(self):
+        # Registration order breaks detection ties; Client B has always
+        # been checked before Client A
         self._adapters = {
-            "client_a": ClientAAdapter(),
             "client_b": ClientBAdapter(),
+            "client_a": ClientAAdapter(),
         }
+        self._by_required = []
+        self._rebuild_fingerprints()
+
+    def _rebuild_fingerprints(self):
+        """
+        Precompute the detection order: adapters with required_keys,
+        most specific (largest key set) first, then in registration order.
+        """
+        self._by_required = sorted(
+            (a for a in self._adapters.values() if a.required_keys),
+            key=lambda a: -len(a.required_keys)
+        )
 
     def get_adapter(self, raw_input: Dict[str, Any]) -> ScheduleAdapter:
         """
@@ -32,12 +52,17 @@ class AdapterFactory:
         Raises:
             ValueError: If client format cannot be determined
         """
+        # Only a JSON object can match either strategy
+        if not isinstance(raw_input, dict):
+            raise ValueError(_UNDETECTED_FORMAT)
+
         # Strategy 1: Explicit client_id
         if "client_id" in raw_input:
             client_id = raw_input["client_id"]
-            if client_id not in self._adapters:
+            adapter = self._adapters.get(client_id)
+            if adapter is None:
                 raise ValueError(f"Unknown client_id: {client_id}")
-            return self._adapters[client_id]
+            return adapter
 
         # Strategy 2: Schema fingerprinting
         return self._detect_adapter(raw_input)
@@ -46,34 +71,28 @@ class AdapterFactory:
         """
         Auto-detect client format based on schema characteristics.
 
-        Client A indicators:
-        - Has "horizon" field with "start"/"end"
-        - Has "products" field
-        - Has "resources" field
+        Each adapter declares the top-level keys that identify its format
+        (ScheduleAdapter.required_keys); the first adapter whose keys are
+        all present wins, checking the most specific adapters first and
+        breaking ties by registration order (Client B before Client A).
 
-        Client B indicators:
-        - Has "shift_window" field
-        - Has "orders" field
-        - Has "machines" field
+        Client A indicators: "horizon" + "products"
+        Client B indicators: "shift_window" + "orders"
         """
-        # Check for Client B indicators
-        if "shift_window" in raw_input and "orders" in raw_input:
-            return self._adapters["client_b"]
-
-        # Check for Client A indicators
-        if "horizon" in raw_input and "products" in raw_input:
-            return self._adapters["client_a"]
+        keys = raw_input.keys()
+        for adapter in self._by_required:
+            if adapter.required_keys <= keys:
+                return adapter
 
         # Cannot determine
-        raise ValueError(
-            "Unable to detect client format. "
-            "Ensure input has either (horizon + products) or (shift_window + orders)"
-        )
+        raise ValueError(_UNDETECTED_FORMAT)
 
     def register_adapter(self, adapter: ScheduleAdapter):
         """
         Register a new client adapter.
 
         Useful for adding Client C, D, etc. without modifying this class.
+        Adapters declaring required_keys are picked up by auto-detection.
         """
         self._adapters[adapter.client_id] = adapter
+        self._rebuild_fingerprints()
@@ -1,33 +1,65 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import orjson
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.models.cdm import ScheduleRequest, ScheduleResponse, ScheduleError
-from src.solver.engine import solve_schedule
+from src.solver.engine import solve_schedule, NUM_SEARCH_WORKERS
 from src.adapters.factory import AdapterFactory
 
+# Every uvicorn worker (WEB_CONCURRENCY) has its own solver pool, and each
+# solve runs SOLVE_SEARCH_WORKERS CP-SAT threads. Split the cores between
+# the API workers first, then between the concurrent solves of one worker,
+# so all in-flight solves together use at most one thread per core (as
+# long as WEB_CONCURRENCY itself doesn't exceed the core count)
+API_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+CORES_PER_API_WORKER = max(1, (os.cpu_count() or 1) // API_WORKERS)
+SOLVE_SEARCH_WORKERS = min(NUM_SEARCH_WORKERS, CORES_PER_API_WORKER)
+SOLVER_POOL_WORKERS = max(1, CORES_PER_API_WORKER // SOLVE_SEARCH_WORKERS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the process pool that runs CP-SAT solves off the event loop."""
+    app.state.solver_pool = ProcessPoolExecutor(max_workers=SOLVER_POOL_WORKERS)
+    try:
+        yield
+    finally:
+        app.state.solver_pool.shutdown(cancel_futures=True)
+
+
 app = FastAPI(
     title="Harmony Production Scheduler",
     description="Constraint-based production scheduling API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Enable CORS for frontend
+# Enable CORS for frontend (only what the UI actually sends)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
 )
 
 adapter_factory = AdapterFactory()
 
+# Pre-rendered so health probes skip response serialization
+HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
 
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 @app.post("/schedule", response_model=ScheduleResponse | ScheduleError)
@@ -47,19 +79,23 @@ async def create_schedule(request: Request):
     - All times within the specified horizon
     """
     try:
-        # Get raw JSON
-        raw_input = await request.json()
+        # Get raw JSON (orjson.JSONDecodeError is a ValueError -> 400)
+        raw_input = orjson.loads(await request.body())
 
         # Auto-detect client format and transform to CDM
         adapter = adapter_factory.get_adapter(raw_input)
         schedule_request = adapter.to_cdm(raw_input)
 
-        # Solve
-        result = solve_schedule(schedule_request)
+        # Solve in the worker pool so the event loop stays responsive
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            request.app.state.solver_pool, solve_schedule, schedule_request,
+            SOLVE_SEARCH_WORKERS
+        )
 
         # Handle infeasible case
         if isinstance(result, ScheduleError):
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=422,
                 content=result.model_dump()
             )
@@ -74,4 +110,4 @@ async def create_schedule(request: Request):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
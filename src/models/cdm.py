@@ -1,9 +1,16 @@
+from bisect import bisect_right
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-from pydantic import BaseModel, Field, field_validator
+from itertools import accumulate
+from operator import itemgetter
+from typing import Any, List, Dict, Tuple, Optional
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+from ..utils.time_utils import to_epoch_us
 
 
 class Horizon(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     start: datetime
     end: datetime
 
@@ -16,25 +23,68 @@ class Horizon(BaseModel):
 
 
 class Resource(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     capabilities: List[str]
-    calendar: List[Tuple[datetime, datetime]]
+    calendar: Tuple[Tuple[datetime, datetime], ...]
+
+    # Calendar in epoch microseconds, derived at construction (and again by
+    # model_copy when calendar is updated): windows ordered by start, and
+    # the running max of their ends in that order
+    _cal_starts: Tuple[int, ...] = PrivateAttr(default=())
+    _cal_ends: Tuple[int, ...] = PrivateAttr(default=())
+    _cal_reach: Tuple[int, ...] = PrivateAttr(default=())
 
     @field_validator('calendar')
     @classmethod
     def validate_calendar(cls, v):
-        for start, end in v:
-            if end <= start:
-                raise ValueError(f'Calendar window end must be after start: {start} -> {end}')
+        bad = next(((start, end) for start, end in v if end <= start), None)
+        if bad is not None:
+            raise ValueError(f'Calendar window end must be after start: {bad[0]} -> {bad[1]}')
         return v
 
+    def model_post_init(self, __context: Any) -> None:
+        self._derive_calendar_us()
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "Resource":
+        copied = super().model_copy(update=update, deep=deep)
+        if update and 'calendar' in update:
+            copied._derive_calendar_us()
+        return copied
+
+    def _derive_calendar_us(self) -> None:
+        windows = sorted(
+            ((to_epoch_us(start), to_epoch_us(end)) for start, end in self.calendar),
+            key=itemgetter(0)
+        )
+        self._cal_starts = tuple(start for start, _ in windows)
+        self._cal_ends = tuple(end for _, end in windows)
+        self._cal_reach = tuple(accumulate(self._cal_ends, max))
+
+    @property
+    def calendar_us(self) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+        """Window starts, ends and running max of ends, ordered by start."""
+        return self._cal_starts, self._cal_ends, self._cal_reach
+
+    def fits(self, start_us: int, end_us: int) -> bool:
+        """Whether [start_us, end_us] (epoch microseconds) lies within one calendar window."""
+        # Windows starting by start_us are a prefix; the furthest end among
+        # them decides
+        i = bisect_right(self._cal_starts, start_us) - 1
+        return i >= 0 and end_us <= self._cal_reach[i]
+
 
 class Operation(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     capability: str
     duration_minutes: int = Field(gt=0)
 
 
 class Product(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     family: str
     due: datetime
@@ -49,18 +99,42 @@ class Product(BaseModel):
 
 
 class ChangeoverMatrix(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     values: Dict[str, int] = Field(default_factory=dict)
 
+    # (from_family, to_family) -> minutes, derived from values at construction
+    # (and again by model_copy when values is updated)
+    _pairs: Dict[Tuple[str, str], int] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._derive_pairs()
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "ChangeoverMatrix":
+        copied = super().model_copy(update=update, deep=deep)
+        if update and 'values' in update:
+            copied._derive_pairs()
+        return copied
+
+    def _derive_pairs(self) -> None:
+        self._pairs = {
+            tuple(key.split("->", 1)): minutes
+            for key, minutes in self.values.items()
+        }
+
     def get_changeover_time(self, from_family: str, to_family: str) -> int:
-        key = f"{from_family}->{to_family}"
-        return self.values.get(key, 0)
+        return self._pairs.get((from_family, to_family), 0)
 
 
 class Settings(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     time_limit_seconds: int = Field(default=30, gt=0)
 
 
 class ScheduleRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     horizon: Horizon
     resources: List[Resource]
     products: List[Product]
@@ -69,6 +143,8 @@ class ScheduleRequest(BaseModel):
 
 
 class Assignment(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     product: str
     op: str
     resource: str
@@ -77,6 +153,8 @@ class Assignment(BaseModel):
 
 
 class KPIs(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     tardiness_minutes: int
     changeovers: int
     makespan_minutes: int
@@ -84,10 +162,14 @@ class KPIs(BaseModel):
 
 
 class ScheduleResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     assignments: List[Assignment]
     kpis: KPIs
 
 
 class ScheduleError(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     error: str
     why: List[str]
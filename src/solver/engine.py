@@ -1,50 +1,76 @@
 from ortools.sat.python import cp_model
+from collections import defaultdict
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
+import os
 import sys
 
 from ..models.cdm import ScheduleRequest, Assignment, ScheduleResponse, KPIs, ScheduleError
 from ..utils.time_utils import to_minutes, from_minutes
+from ..validation.kpis import calculate_kpis
+
+# CP-SAT portfolio size; time_limit_seconds is wall-clock shared by all workers
+NUM_SEARCH_WORKERS = min(8, os.cpu_count() or 1)
 
 
 class ScheduleSolver:
-    def __init__(self, request: ScheduleRequest):
+    def __init__(self, request: ScheduleRequest, num_search_workers: int = NUM_SEARCH_WORKERS):
         self.request = request
+        self.num_search_workers = num_search_workers
         self.model = cp_model.CpModel()
         self.reference_time = request.horizon.start
 
+        # Minute offsets already computed; the same datetimes (horizon end,
+        # shared calendar bounds, due dates) recur across resources/products
+        self._min_cache: Dict[datetime, int] = {}
+
         # Convert time bounds to minutes
         self.horizon_start = 0
-        self.horizon_end = to_minutes(request.horizon.end, self.reference_time)
+        self.horizon_end = self._tmin(request.horizon.end)
 
         # Build resource capability map
         self.resource_map = self._build_resource_map()
 
+        # Calendar windows in minutes, indexed by resource
+        self._calendar_minutes = [
+            self._convert_calendar_to_minutes(res_idx)
+            for res_idx in range(len(request.resources))
+        ]
+
         # Storage for decision variables
         self.operations = []
+        self.eligible_by_op_id = []
         self.intervals = {}
         self.starts = {}
         self.ends = {}
         self.resource_assignments = {}
         self.product_completion_times = {}
+        self._due_minutes = {}
+        self._all_capabilities = set()
+
+    def _tmin(self, dt: datetime) -> int:
+        """Memoized to_minutes(dt, reference_time)."""
+        minutes = self._min_cache.get(dt)
+        if minutes is None:
+            minutes = to_minutes(dt, self.reference_time)
+            self._min_cache[dt] = minutes
+        return minutes
 
     def _build_resource_map(self) -> Dict[str, List[int]]:
         """Map capabilities to resource indices."""
-        cap_map = {}
+        cap_map = defaultdict(list)
         for idx, resource in enumerate(self.request.resources):
             for cap in resource.capabilities:
-                if cap not in cap_map:
-                    cap_map[cap] = []
                 cap_map[cap].append(idx)
-        return cap_map
+        return dict(cap_map)
 
     def _convert_calendar_to_minutes(self, resource_idx: int) -> List[Tuple[int, int]]:
         """Convert resource calendar windows to minute offsets."""
         resource = self.request.resources[resource_idx]
         windows = []
         for start_dt, end_dt in resource.calendar:
-            start_min = to_minutes(start_dt, self.reference_time)
-            end_min = to_minutes(end_dt, self.reference_time)
+            start_min = self._tmin(start_dt)
+            end_min = self._tmin(end_dt)
             windows.append((start_min, end_min))
         return windows
 
@@ -53,10 +79,12 @@ class ScheduleSolver:
         op_id = 0
 
         # Create variables for each operation
-        for product in self.request.products:
+        for product_idx, product in enumerate(self.request.products):
             product_ops = []
+            self._due_minutes[product.id] = self._tmin(product.due)
 
             for op_idx, operation in enumerate(product.route):
+                self._all_capabilities.add(operation.capability)
                 eligible_resources = self.resource_map.get(operation.capability, [])
 
                 if not eligible_resources:
@@ -80,52 +108,57 @@ class ScheduleSolver:
                 # Duration constraint
                 self.model.Add(end_var == start_var + operation.duration_minutes)
 
-                # Resource assignment
-                resource_var = self.model.NewIntVarFromDomain(
-                    cp_model.Domain.FromValues(eligible_resources),
-                    f"resource_{product.id}_op{op_idx}"
-                )
-
                 # Create interval variables for each possible resource assignment
                 intervals_for_op = []
-                assignment_bools = []
-
-                for res_idx in eligible_resources:
-                    is_assigned = self.model.NewBoolVar(
-                        f"assigned_{product.id}_op{op_idx}_res{res_idx}"
-                    )
-                    self.model.Add(resource_var == res_idx).OnlyEnforceIf(is_assigned)
-                    self.model.Add(resource_var != res_idx).OnlyEnforceIf(is_assigned.Not())
 
-                    assignment_bools.append(is_assigned)
-
-                    interval = self.model.NewOptionalIntervalVar(
+                if len(eligible_resources) == 1:
+                    # Resource is fixed: one mandatory interval, no assignment
+                    # literal (stored as None, meaning "always present")
+                    res_idx = eligible_resources[0]
+                    interval = self.model.NewIntervalVar(
                         start_var,
                         operation.duration_minutes,
                         end_var,
-                        is_assigned,
                         f"interval_{product.id}_op{op_idx}_res{res_idx}"
                     )
-                    intervals_for_op.append((res_idx, interval, is_assigned))
-
-                # Exactly one resource must be selected
-                self.model.AddExactlyOne(assignment_bools)
+                    intervals_for_op.append((res_idx, interval, None))
+                else:
+                    assignment_bools = []
+
+                    for res_idx in eligible_resources:
+                        is_assigned = self.model.NewBoolVar(
+                            f"assigned_{product.id}_op{op_idx}_res{res_idx}"
+                        )
+                        assignment_bools.append(is_assigned)
+
+                        interval = self.model.NewOptionalIntervalVar(
+                            start_var,
+                            operation.duration_minutes,
+                            end_var,
+                            is_assigned,
+                            f"interval_{product.id}_op{op_idx}_res{res_idx}"
+                        )
+                        intervals_for_op.append((res_idx, interval, is_assigned))
+
+                    # Exactly one resource must be selected
+                    self.model.AddExactlyOne(assignment_bools)
 
                 # Store operation info
                 self.operations.append({
                     'id': op_id,
                     'product': product.id,
-                    'product_idx': self.request.products.index(product),
+                    'product_idx': product_idx,
                     'op_index': op_idx,
                     'capability': operation.capability,
                     'duration': operation.duration_minutes,
                     'family': product.family,
                     'start': start_var,
                     'end': end_var,
-                    'resource': resource_var,
                     'intervals': intervals_for_op,
                 })
 
+                self.eligible_by_op_id.append(eligible_resources)
+
                 product_ops.append(op_id)
                 op_id += 1
 
@@ -148,16 +181,18 @@ class ScheduleSolver:
         # Objective: minimize total tardiness
         self._set_objective()
 
+        # Warm start from a greedy schedule
+        self._add_solution_hint()
+
     def _add_no_overlap_constraints(self):
         """Ensure no two operations overlap on the same resource."""
-        for res_idx in range(len(self.request.resources)):
-            intervals_on_resource = []
-
-            for op in self.operations:
-                for r_idx, interval, _ in op['intervals']:
-                    if r_idx == res_idx:
-                        intervals_on_resource.append(interval)
+        # Bucket intervals by resource in a single pass over operations
+        intervals_by_resource = [[] for _ in self.request.resources]
+        for op in self.operations:
+            for r_idx, interval, _ in op['intervals']:
+                intervals_by_resource[r_idx].append(interval)
 
+        for intervals_on_resource in intervals_by_resource:
             if intervals_on_resource:
                 self.model.AddNoOverlap(intervals_on_resource)
 
@@ -165,24 +200,28 @@ class ScheduleSolver:
         """Ensure operations fit within resource working windows."""
         for op in self.operations:
             for res_idx, interval, is_assigned in op['intervals']:
-                windows = self._convert_calendar_to_minutes(res_idx)
-
-                # Operation must start and end within one of the windows
-                window_literals = []
-                for w_start, w_end in windows:
-                    in_window = self.model.NewBoolVar(
-                        f"in_window_{op['id']}_res{res_idx}_w{w_start}"
-                    )
-
-                    # If in this window, start >= w_start and end <= w_end
-                    self.model.Add(op['start'] >= w_start).OnlyEnforceIf([is_assigned, in_window])
-                    self.model.Add(op['end'] <= w_end).OnlyEnforceIf([is_assigned, in_window])
-
-                    window_literals.append(in_window)
-
-                # At least one window must be active if assigned
-                if window_literals:
-                    self.model.AddBoolOr(window_literals).OnlyEnforceIf(is_assigned)
+                windows = self._calendar_minutes[res_idx]
+
+                # Fixed-resource ops (no literal) are constrained unconditionally
+                enforce = [] if is_assigned is None else [is_assigned]
+
+                # Single window: plain bounds, no window literals needed
+                if len(windows) == 1:
+                    w_start, w_end = windows[0]
+                    self.model.Add(op['start'] >= w_start).OnlyEnforceIf(enforce)
+                    self.model.Add(op['end'] <= w_end).OnlyEnforceIf(enforce)
+                    continue
+
+                # Otherwise restrict start to the union of feasible start ranges,
+                # i.e. [w_start, w_end - duration] for every window long enough
+                start_domain = cp_model.Domain.FromIntervals([
+                    [w_start, w_end - op['duration']]
+                    for w_start, w_end in windows
+                    if w_end - w_start >= op['duration']
+                ])
+                self.model.AddLinearExpressionInDomain(
+                    op['start'], start_domain
+                ).OnlyEnforceIf(enforce)
 
     def _set_objective(self):
         """Minimize total tardiness."""
@@ -190,7 +229,7 @@ class ScheduleSolver:
 
         for product in self.request.products:
             completion_time = self.product_completion_times[product.id]
-            due_time = to_minutes(product.due, self.reference_time)
+            due_time = self._due_minutes[product.id]
 
             # Tardiness = max(0, completion - due)
             tardiness = self.model.NewIntVar(0, self.horizon_end, f"tardiness_{product.id}")
@@ -200,11 +239,84 @@ class ScheduleSolver:
 
         self.model.Minimize(sum(tardiness_vars))
 
+    def _earliest_fit(self, res_idx: int, earliest: int, duration: int) -> Optional[int]:
+        """Earliest start >= earliest that fits a calendar window of the resource."""
+        best = None
+        for w_start, w_end in self._calendar_minutes[res_idx]:
+            start = max(earliest, w_start)
+            if start + duration <= min(w_end, self.horizon_end):
+                if best is None or start < best:
+                    best = start
+        return best
+
+    def _compute_heuristic_solution(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Earliest-start list schedule used to seed the solver.
+
+        Products are taken in due-date order; each operation goes to the
+        eligible resource where it can start (and so finish) earliest, given
+        the route predecessor and the resource's next free minute.
+
+        Returns:
+            Mapping op id -> (start minute, resource index) for every
+            operation the heuristic could place
+        """
+        ops_by_product = [[] for _ in self.request.products]
+        for op in self.operations:
+            ops_by_product[op['product_idx']].append(op)
+
+        product_order = sorted(
+            range(len(self.request.products)),
+            key=lambda p_idx: self.request.products[p_idx].due
+        )
+
+        next_free = [self.horizon_start] * len(self.request.resources)
+        placement = {}
+
+        for p_idx in product_order:
+            ready = self.horizon_start
+            for op in ops_by_product[p_idx]:
+                best = None
+                for res_idx in self.eligible_by_op_id[op['id']]:
+                    start = self._earliest_fit(
+                        res_idx, max(ready, next_free[res_idx]), op['duration']
+                    )
+                    if start is not None and (best is None or start < best[0]):
+                        best = (start, res_idx)
+
+                # Leave the rest of this route unhinted
+                if best is None:
+                    break
+
+                start, res_idx = best
+                placement[op['id']] = best
+                ready = next_free[res_idx] = start + op['duration']
+
+        return placement
+
+    def _add_solution_hint(self):
+        """Hint start times and resource choices from the greedy schedule."""
+        placement = self._compute_heuristic_solution()
+
+        for op in self.operations:
+            if op['id'] not in placement:
+                continue
+
+            start, chosen_idx = placement[op['id']]
+            self.model.AddHint(op['start'], start)
+            self.model.AddHint(op['end'], start + op['duration'])
+            for res_idx, _, is_assigned in op['intervals']:
+                if is_assigned is not None:
+                    self.model.AddHint(is_assigned, int(res_idx == chosen_idx))
+
     def solve(self) -> ScheduleResponse | ScheduleError:
         """Solve the scheduling problem."""
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = self.request.settings.time_limit_seconds
         solver.parameters.log_search_progress = False
+        solver.parameters.num_search_workers = self.num_search_workers
+        solver.parameters.linearization_level = 2
+        solver.parameters.random_seed = 0
 
         status = solver.Solve(self.model)
 
@@ -220,7 +332,10 @@ class ScheduleSolver:
         for op in self.operations:
             start_min = solver.Value(op['start'])
             end_min = solver.Value(op['end'])
-            resource_idx = solver.Value(op['resource'])
+            resource_idx = next(
+                r_idx for r_idx, _, is_assigned in op['intervals']
+                if is_assigned is None or solver.BooleanValue(is_assigned)
+            )
 
             assignment = Assignment(
                 product=op['product'],
@@ -232,7 +347,6 @@ class ScheduleSolver:
             assignments.append(assignment)
 
         # Calculate KPIs
-        from ..validation.kpis import calculate_kpis
         kpis = calculate_kpis(self.request, assignments)
 
         return ScheduleResponse(assignments=assignments, kpis=kpis)
@@ -247,7 +361,7 @@ class ScheduleSolver:
             # Check for obvious issues
             for product in self.request.products:
                 total_duration = sum(op.duration_minutes for op in product.route)
-                due_offset = to_minutes(product.due, self.reference_time)
+                due_offset = self._due_minutes[product.id]
 
                 if total_duration > due_offset:
                     reasons.append(
@@ -256,7 +370,7 @@ class ScheduleSolver:
                     )
 
             # Check resource availability
-            for cap in set(op.capability for p in self.request.products for op in p.route):
+            for cap in self._all_capabilities:
                 if cap not in self.resource_map:
                     reasons.append(f"No resource available for capability: {cap}")
 
@@ -271,8 +385,11 @@ class ScheduleSolver:
         )
 
 
-def solve_schedule(request: ScheduleRequest) -> ScheduleResponse | ScheduleError:
+def solve_schedule(
+    request: ScheduleRequest,
+    num_search_workers: int = NUM_SEARCH_WORKERS
+) -> ScheduleResponse | ScheduleError:
     """Main entry point for solving a schedule."""
-    solver = ScheduleSolver(request)
+    solver = ScheduleSolver(request, num_search_workers)
     solver.build_model()
     return solver.solve()
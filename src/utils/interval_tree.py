@@ -0,0 +1,140 @@
+from itertools import count
+from typing import Any, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("key", "end", "payload", "left", "right", "height", "max_end")
+
+    def __init__(self, key: Tuple[Any, int], end: Any, payload: Any):
+        self.key = key
+        self.end = end
+        self.payload = payload
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.height = 1
+        self.max_end = end
+
+
+class IntervalTree:
+    """
+    Augmented AVL tree of half-open intervals [start, end).
+
+    Nodes are ordered by start and carry the maximum end of their subtree,
+    so query() can skip every subtree that ends before the query starts.
+    Insert/remove are O(log n); a query is O(log n + k) for k results.
+
+    Bounds only need to be mutually comparable (ints, datetimes, ...).
+    """
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._seq = count()  # tie-breaker for equal starts
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, start: Any, end: Any, payload: Any = None) -> Tuple[Any, int]:
+        """Insert an interval; returns the key needed to remove it later."""
+        key = (start, next(self._seq))
+        self._root = self._insert(self._root, _Node(key, end, payload))
+        self._size += 1
+        return key
+
+    def remove(self, key: Tuple[Any, int]):
+        """
+        Remove the interval inserted under key.
+
+        Raises:
+            KeyError: If no interval with that key is stored
+        """
+        self._root = self._remove(self._root, key)
+        self._size -= 1
+
+    def query(self, start: Any, end: Any) -> List[Any]:
+        """Payloads of all stored intervals overlapping [start, end), in start order."""
+        result = []
+        self._query(self._root, start, end, result)
+        return result
+
+    def _query(self, node: Optional[_Node], start: Any, end: Any, out: List[Any]):
+        if node is None or node.max_end <= start:
+            return
+        self._query(node.left, start, end, out)
+        # Right subtree starts no earlier than this node
+        if node.key[0] < end:
+            if node.end > start:
+                out.append(node.payload)
+            self._query(node.right, start, end, out)
+
+    # AVL maintenance
+
+    @staticmethod
+    def _height(node: Optional[_Node]) -> int:
+        return node.height if node is not None else 0
+
+    def _update(self, node: _Node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.max_end = node.end
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    def _rotate_right(self, node: _Node) -> _Node:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node: _Node) -> _Node:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rebalance(self, node: _Node) -> _Node:
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+        if balance > 1:
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if new.key < node.key:
+            node.left = self._insert(node.left, new)
+        else:
+            node.right = self._insert(node.right, new)
+        return self._rebalance(node)
+
+    def _remove(self, node: Optional[_Node], key: Tuple[Any, int]) -> Optional[_Node]:
+        if node is None:
+            raise KeyError(key)
+        if key < node.key:
+            node.left = self._remove(node.left, key)
+        elif key > node.key:
+            node.right = self._remove(node.right, key)
+        else:
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            # Replace with in-order successor
+            successor = node.right
+            while successor.left is not None:
+                successor = successor.left
+            node.right = self._remove(node.right, successor.key)
+            node.key, node.end, node.payload = successor.key, successor.end, successor.payload
+        return self._rebalance(node)
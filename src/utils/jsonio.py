@@ -0,0 +1,23 @@
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional outside the API server
+    orjson = None
+    import json
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Uses orjson (reads the whole file as bytes and parses it in one call)
+    when installed, the standard json module otherwise.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    with open(path) as f:
+        return json.load(f)
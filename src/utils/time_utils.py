@@ -1,6 +1,12 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Tuple
 
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+US_PER_MINUTE = 60_000_000
+
 
 def to_minutes(dt: datetime, reference: datetime) -> int:
     """Convert datetime to minutes offset from reference time."""
@@ -8,6 +14,17 @@ def to_minutes(dt: datetime, reference: datetime) -> int:
     return int(delta.total_seconds() / 60)
 
 
+def to_epoch_us(dt: datetime) -> int:
+    """
+    Convert datetime to integer microseconds since 1970-01-01.
+
+    Exact (no float rounding). Naive datetimes are measured from a naive
+    epoch, i.e. taken at face value with no local-time conversion.
+    """
+    epoch = _EPOCH if dt.tzinfo is None else _EPOCH_UTC
+    return (dt - epoch) // _MICROSECOND
+
+
 def from_minutes(minutes: int, reference: datetime) -> datetime:
     """Convert minutes offset back to datetime."""
     from datetime import timedelta
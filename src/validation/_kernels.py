@@ -0,0 +1,324 @@
+"""
+Numeric kernels behind the validation checks.
+
+Kernels only see the int arrays built by materialize_assignments and
+ValidationContext and return indices; the checkers turn those into error
+messages. With numba installed the loop kernels are compiled with
+@njit(cache=True), so the compiled code is reused across processes; the
+per-resource overlap sweep also runs resources in parallel (prange).
+A val_kernels module built by _kernels_aot.py takes precedence and needs
+no compilation at import, as long as it was built from the current version
+of this file (it records a hash of it; a stale build is ignored). Without
+numba, equivalent NumPy / pure-Python implementations are used.
+"""
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from ..utils.interval_tree import IntervalTree
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional
+    njit = None
+    prange = range
+
+HAVE_NUMBA = njit is not None
+
+try:
+    # Ahead-of-time build, see _kernels_aot.py
+    from . import val_kernels
+except ImportError:
+    val_kernels = None
+
+
+def _sweep_group(starts, ends, by_res, lo, hi, out, offset):
+    """
+    Overlapping pairs among by_res[lo:hi] (one resource, in start order).
+
+    Keeps the ops still running: an op that ended by the current start
+    can't overlap any later op (later ops start no earlier), so it is
+    dropped from the active set. Returns the pair count; pairs are written
+    to out[offset:] unless out is empty (counting pass).
+    """
+    write = out.shape[0] > 0
+    active = np.empty(hi - lo, dtype=np.int64)
+    n_active = 0
+    n_pairs = 0
+
+    for k in range(lo, hi):
+        j = by_res[k]
+        kept = 0
+        for a in range(n_active):
+            i = active[a]
+            if ends[i] > starts[j]:
+                active[kept] = i
+                kept += 1
+                if starts[i] < ends[j]:
+                    if write:
+                        out[offset + n_pairs, 0] = i
+                        out[offset + n_pairs, 1] = j
+                    n_pairs += 1
+        active[kept] = j
+        n_active = kept + 1
+
+    return n_pairs
+
+
+def _overlap_pairs_loop(starts, ends, by_res, res_bounds):
+    """
+    Resources are independent, so both passes run in parallel over them:
+    count pairs per resource, then fill each resource's slice of the output.
+    """
+    num_groups = res_bounds.size - 1
+    counts = np.zeros(num_groups, dtype=np.int64)
+    no_output = np.empty((0, 2), dtype=np.int64)
+    for g in prange(num_groups):
+        counts[g] = _sweep_group(starts, ends, by_res, res_bounds[g], res_bounds[g + 1], no_output, 0)
+
+    offsets = np.zeros(num_groups + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(counts)
+    out = np.empty((offsets[-1], 2), dtype=np.int64)
+    for g in prange(num_groups):
+        if counts[g] > 0:
+            _sweep_group(starts, ends, by_res, res_bounds[g], res_bounds[g + 1], out, offsets[g])
+
+    return out
+
+
+def _overlap_candidates_loop(starts, ends, by_res, res_bounds):
+    """Single sweep per resource against the running max of earlier ends."""
+    out = np.empty(by_res.size, dtype=np.int64)
+    n = 0
+
+    for g in range(res_bounds.size - 1):
+        lo = res_bounds[g]
+        hi = res_bounds[g + 1]
+        if lo == hi:
+            continue
+        running = ends[by_res[lo]]
+        for k in range(lo + 1, hi):
+            j = by_res[k]
+            if starts[j] < running:
+                out[n] = j
+                n += 1
+            running = max(running, ends[j])
+
+    return out[:n]
+
+
+def _overlap_candidates_numpy(starts, ends, by_res, res_bounds):
+    """np.maximum.accumulate over each resource's ends in start order."""
+    found = []
+
+    for lo, hi in zip(res_bounds[:-1].tolist(), res_bounds[1:].tolist()):
+        if hi - lo < 2:
+            continue
+        ops = by_res[lo:hi]
+        running = np.maximum.accumulate(ends[ops[:-1]])
+        found.append(ops[1:][starts[ops[1:]] < running])
+
+    return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+
+def _overlap_pairs_tree(starts, ends, by_res, res_bounds):
+    """Pure-Python sweep querying an interval tree of the ops seen so far."""
+    starts = starts.tolist()
+    ends = ends.tolist()
+    by_res = by_res.tolist()
+    bounds = res_bounds.tolist()
+
+    pairs = []
+    for lo, hi in zip(bounds, bounds[1:]):
+        tree = IntervalTree()
+        for j in by_res[lo:hi]:
+            for i in tree.query(starts[j], ends[j]):
+                pairs.append((i, j))
+            tree.insert(starts[j], ends[j], j)
+
+    return np.array(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _calendar_violations_loop(starts, ends, by_res, res_bounds, cal_offsets, cal_starts, cal_reach):
+    """Binary-search each op's start among its resource's window starts."""
+    out = np.zeros(starts.size, dtype=np.bool_)
+
+    for r in range(cal_offsets.size - 1):
+        first = cal_offsets[r]
+        last = cal_offsets[r + 1]
+        for k in range(res_bounds[r], res_bounds[r + 1]):
+            j = by_res[k]
+            # bisect_right(cal_starts[first:last], starts[j])
+            lo = first
+            hi = last
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if cal_starts[mid] <= starts[j]:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            out[j] = lo == first or ends[j] > cal_reach[lo - 1]
+
+    return out
+
+
+def _calendar_violations_numpy(starts, ends, by_res, res_bounds, cal_offsets, cal_starts, cal_reach):
+    """One np.searchsorted per resource over all of its ops."""
+    out = np.zeros(starts.size, dtype=bool)
+
+    for r in range(len(cal_offsets) - 1):
+        ops = by_res[res_bounds[r]:res_bounds[r + 1]]
+        if len(ops) == 0:
+            continue
+        first, last = cal_offsets[r], cal_offsets[r + 1]
+        if first == last:
+            out[ops] = True
+            continue
+
+        i = np.searchsorted(cal_starts[first:last], starts[ops], side="right") - 1
+        out[ops] = (i < 0) | (ends[ops] > cal_reach[first:last][np.maximum(i, 0)])
+
+    return out
+
+
+def _precedence_violations_loop(starts, ends, curr_idx, next_idx):
+    """Compare each route pair's assignments by index."""
+    out = np.empty(curr_idx.size, dtype=np.int64)
+    n = 0
+    for k in range(curr_idx.size):
+        i = curr_idx[k]
+        j = next_idx[k]
+        if i >= 0 and j >= 0 and ends[i] > starts[j]:
+            out[n] = k
+            n += 1
+    return out[:n]
+
+
+def _precedence_violations_numpy(starts, ends, curr_idx, next_idx):
+    """Gather both sides of every route pair and compare at once."""
+    if starts.size == 0:
+        return np.empty(0, dtype=np.int64)
+    present = (curr_idx >= 0) & (next_idx >= 0)
+    late = ends[np.maximum(curr_idx, 0)] > starts[np.maximum(next_idx, 0)]
+    return np.flatnonzero(present & late)
+
+
+def source_hash() -> int:
+    """crc32 of this file, recorded in val_kernels when it is built."""
+    return zlib.crc32(Path(__file__).read_bytes())
+
+
+if val_kernels is not None and val_kernels.source_hash() != source_hash():
+    val_kernels = None  # built from an older version of the kernels
+
+if HAVE_NUMBA:
+    # Rebound before first call (or AOT build), so the overlap kernel
+    # compiles against it
+    _sweep_group = njit(cache=True)(_sweep_group)
+
+if val_kernels is not None:
+    _overlap_candidates = val_kernels.overlap_candidates
+    _overlap_pairs = val_kernels.overlap_pairs
+    _calendar_violations = val_kernels.calendar_violations
+    _precedence_violations = val_kernels.precedence_violations
+elif HAVE_NUMBA:
+    _overlap_candidates = njit(cache=True)(_overlap_candidates_loop)
+    _overlap_pairs = njit(cache=True, parallel=True)(_overlap_pairs_loop)
+    _calendar_violations = njit(cache=True)(_calendar_violations_loop)
+    _precedence_violations = njit(cache=True)(_precedence_violations_loop)
+else:
+    _overlap_candidates = _overlap_candidates_numpy
+    _overlap_pairs = _overlap_pairs_tree
+    _calendar_violations = _calendar_violations_numpy
+    _precedence_violations = _precedence_violations_numpy
+
+
+def overlap_candidates(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    by_res: np.ndarray,
+    res_bounds: np.ndarray
+) -> np.ndarray:
+    """
+    Ops that start before an earlier op on the same resource has ended.
+
+    One pass per resource keeps the running max of the ends seen so far,
+    so a clean schedule is confirmed in O(n) without enumerating pairs.
+    Every op that is the later half of an overlapping pair is returned;
+    an empty result means overlap_pairs would find nothing.
+
+    Args:
+        starts, ends: int64 times per assignment
+        by_res, res_bounds: grouping from materialize_assignments
+
+    Returns:
+        int64 assignment indices, grouped by resource in start order.
+    """
+    return _overlap_candidates(starts, ends, by_res, res_bounds)
+
+
+def overlap_pairs(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    by_res: np.ndarray,
+    res_bounds: np.ndarray
+) -> np.ndarray:
+    """
+    Overlapping pairs of ops on the same resource.
+
+    Args:
+        starts, ends: int64 times per assignment
+        by_res, res_bounds: grouping from materialize_assignments
+
+    Returns:
+        (P, 2) int64 array of assignment indices (i, j) where i precedes j
+        in (resource, start) order; grouped by resource, ordered by j.
+    """
+    return _overlap_pairs(starts, ends, by_res, res_bounds)
+
+
+def calendar_violations(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    by_res: np.ndarray,
+    res_bounds: np.ndarray,
+    cal_offsets: np.ndarray,
+    cal_starts: np.ndarray,
+    cal_reach: np.ndarray
+) -> np.ndarray:
+    """
+    Mask of ops on a known resource that fit in none of its calendar windows.
+
+    Args:
+        starts, ends: int64 times per assignment
+        by_res, res_bounds: grouping from materialize_assignments
+        cal_offsets, cal_starts, cal_reach: flattened calendars from
+            ValidationContext
+
+    Returns:
+        bool array per assignment; ops on unknown resources are False.
+    """
+    return _calendar_violations(
+        starts, ends, by_res, res_bounds, cal_offsets, cal_starts, cal_reach
+    )
+
+
+def precedence_violations(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    curr_idx: np.ndarray,
+    next_idx: np.ndarray
+) -> np.ndarray:
+    """
+    Route pairs whose earlier step ends after the later step starts.
+
+    Args:
+        starts, ends: int64 times per assignment
+        curr_idx, next_idx: assignment index of each route pair's earlier
+            and later step, -1 where the step has no assignment
+
+    Returns:
+        Indices of the violating pairs, in order.
+    """
+    return _precedence_violations(starts, ends, curr_idx, next_idx)
@@ -0,0 +1,49 @@
+"""
+Ahead-of-time build of the validation kernels.
+
+    python -m src.validation._kernels_aot
+
+compiles the numba loop kernels from _kernels.py into a val_kernels
+extension module next to this file (requires numba). _kernels.py imports
+it when present and built from the current _kernels.py, so CLI runs such
+as validate_schedule.py skip JIT compilation entirely; otherwise it falls
+back to @njit(cache=True).
+
+Signatures are fixed: every array is int64 except the bool calendar mask,
+matching what materialize_assignments and ValidationContext produce.
+"""
+from pathlib import Path
+
+from numba.pycc import CC
+
+from . import _kernels
+
+cc = CC("val_kernels")
+cc.output_dir = str(Path(__file__).parent)
+
+# Frozen into the build; _kernels.py ignores val_kernels once it changes
+SOURCE_HASH = _kernels.source_hash()
+
+
+@cc.export("source_hash", "i8()")
+def source_hash():
+    return SOURCE_HASH
+
+
+cc.export("overlap_candidates", "i8[:](i8[:], i8[:], i8[:], i8[:])")(
+    _kernels._overlap_candidates_loop
+)
+# AOT code can't use the parallel backend; the loop runs serially
+cc.export("overlap_pairs", "i8[:, :](i8[:], i8[:], i8[:], i8[:])")(
+    _kernels._overlap_pairs_loop
+)
+cc.export("calendar_violations", "b1[:](i8[:], i8[:], i8[:], i8[:], i8[:], i8[:], i8[:])")(
+    _kernels._calendar_violations_loop
+)
+cc.export("precedence_violations", "i8[:](i8[:], i8[:], i8[:], i8[:])")(
+    _kernels._precedence_violations_loop
+)
+
+
+if __name__ == "__main__":
+    cc.compile()
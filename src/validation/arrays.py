@@ -0,0 +1,157 @@
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..models.cdm import ScheduleRequest, Assignment
+from ..utils.time_utils import to_epoch_us
+from .context import ValidationContext
+
+
+# One packed record per assignment, mirroring the materialized arrays
+ASSIGNMENT_DTYPE = np.dtype([
+    ("start", "i8"),
+    ("end", "i8"),
+    ("res", "i4"),
+    ("prod", "i4"),
+    ("op", "i4"),
+])
+
+
+def _index_ids(
+    index: Dict[str, int],
+    num_known: int,
+    ids: Iterable[str],
+    count: int
+) -> np.ndarray:
+    """
+    Map ids to indices through index (id -> position among num_known ids).
+
+    Ids missing from index get fresh indices past num_known, so distinct
+    unknown ids never share a group.
+    """
+    unknown = {}
+    next_idx = num_known
+    out = np.empty(count, dtype=np.int32)
+    for i, id_ in enumerate(ids):
+        idx = index.get(id_)
+        if idx is None:
+            idx = unknown.get(id_)
+            if idx is None:
+                idx = unknown[id_] = next_idx
+                next_idx += 1
+        out[i] = idx
+    return out
+
+
+def _group_bounds(sorted_keys: np.ndarray, num_known: int) -> np.ndarray:
+    """
+    Slice bounds per key of an ordering sorted by key: group k is
+    order[bounds[k]:bounds[k + 1]]. Covers every known key, even empty ones.
+    """
+    num_groups = max(num_known, int(sorted_keys[-1]) + 1 if sorted_keys.size else 0)
+    return np.searchsorted(sorted_keys, np.arange(num_groups + 1))
+
+
+def materialize_assignments(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Convert assignments to parallel arrays (struct of arrays).
+
+    A context from prepare() for the same assignment list returns its
+    arrays without converting again.
+
+    Returns:
+        "starts"/"ends": int64 microseconds since the epoch (exact)
+        "res": int32 index into request.resources
+        "prod": int32 index into request.products
+        "op": int32 capability code (ValidationContext.capability_lookup),
+            -1 for capabilities no route uses
+        "by_res": assignment indices ordered by (resource, start), stable
+        "res_bounds": by_res[res_bounds[r]:res_bounds[r + 1]] are the
+            assignments on resource index r
+        "by_prod"/"prod_bounds": same for product index, in input order
+        Ids not present in the request map to indices >= len(resources)
+        or len(products) respectively.
+    """
+    if context is None:
+        context = ValidationContext.from_request(request)
+    elif context.arrays is not None and context.assignments is assignments:
+        return context.arrays
+
+    n = len(assignments)
+    starts = np.fromiter((to_epoch_us(a.start) for a in assignments), dtype=np.int64, count=n)
+    res = _index_ids(context.resource_lookup, len(request.resources), (a.resource for a in assignments), n)
+
+    prod = _index_ids(
+        context.product_lookup, len(request.products), (a.product for a in assignments), n
+    )
+
+    op = np.fromiter(
+        (context.capability_lookup.get(a.op, -1) for a in assignments), dtype=np.int32, count=n
+    )
+
+    # Groupings computed once for every per-resource / per-product check;
+    # groups are index slices, no per-group lists are built
+    by_res = np.lexsort((starts, res))
+    by_prod = np.argsort(prod, kind="stable")
+
+    return {
+        "starts": starts,
+        "ends": np.fromiter((to_epoch_us(a.end) for a in assignments), dtype=np.int64, count=n),
+        "res": res,
+        "prod": prod,
+        "op": op,
+        "by_res": by_res,
+        "res_bounds": _group_bounds(res[by_res], len(request.resources)),
+        "by_prod": by_prod,
+        "prod_bounds": _group_bounds(prod[by_prod], len(request.products)),
+    }
+
+
+def to_struct_array(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> np.ndarray:
+    """
+    Pack assignments into one structured array of ASSIGNMENT_DTYPE records
+    (same units and indices as materialize_assignments), e.g. for np.save
+    or handing a schedule to other array code.
+
+    The checks keep using the separate per-field arrays: fields of a
+    structured array are strided views, while each materialized array is
+    contiguous.
+    """
+    arrays = materialize_assignments(request, assignments, context)
+    out = np.empty(len(assignments), dtype=ASSIGNMENT_DTYPE)
+    out["start"] = arrays["starts"]
+    out["end"] = arrays["ends"]
+    out["res"] = arrays["res"]
+    out["prod"] = arrays["prod"]
+    out["op"] = arrays["op"]
+    return out
+
+
+def prepare(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> ValidationContext:
+    """
+    Build a context carrying both the request lookups and the materialized
+    assignment arrays.
+
+    Pass the result to validate_schedule and calculate_kpis (with the same
+    assignment list) to convert and group the assignments only once.
+    """
+    if context is None:
+        context = ValidationContext.from_request(request)
+    return replace(
+        context,
+        assignments=assignments,
+        arrays=materialize_assignments(request, assignments, context)
+    )
@@ -1,131 +1,236 @@
-from typing import List, Tuple
-from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from ..models.cdm import ScheduleRequest, Assignment
-from ..utils.time_utils import to_minutes, intervals_overlap
+from .arrays import materialize_assignments
+from .context import ValidationContext
+from ._kernels import (
+    overlap_candidates, overlap_pairs, calendar_violations, precedence_violations
+)
+
+
+# Violations are collected as compact records of assignment / route
+# indices; strings are only rendered by format_errors.
+#   ("overlap", i, j)             assignments i and j overlap on a resource
+#   ("precedence", p, pos, i, j)  product p: route step pos (assignment i)
+#                                 ends after step pos + 1 (assignment j) starts
+#   ("unknown_resource", i)
+#   ("calendar", i)
+#   ("horizon", i)
+ErrorRecord = Tuple[Any, ...]
+
+
+def validate_schedule(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> Tuple[bool, List[str]]:
+    """Run all validation checks on a schedule."""
+    records = find_violations(request, assignments, context)
+    return len(records) == 0, format_errors(request, assignments, records)
 
 
-def validate_schedule(request: ScheduleRequest, assignments: List[Assignment]) -> Tuple[bool, List[str]]:
-    """Run all validation checks on a schedule."""
-    errors = []
+def find_violations(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> List[ErrorRecord]:
+    """
+    Run all validation checks, returning error records without formatting.
 
-    errors.extend(check_no_overlap(request, assignments))
-    errors.extend(check_precedence(request, assignments))
-    errors.extend(check_calendar_compliance(request, assignments))
-    errors.extend(check_horizon_bounds(request, assignments))
+    Use this when only the presence or count of violations matters;
+    format_errors renders the same messages validate_schedule returns.
+    """
+    records = []
 
-    return len(errors) == 0, errors
+    if context is None:
+        context = ValidationContext.from_request(request)
 
+    # One pass over the assignments converts them to int arrays and groups
+    # them by resource; the checks below only read these shared views
+    arrays = materialize_assignments(request, assignments, context)
 
-def check_no_overlap(request: ScheduleRequest, assignments: List[Assignment]) -> List[str]:
-    """Verify no operations overlap on the same resource."""
-    errors = []
-    resource_ops = defaultdict(list)
-
-    for a in assignments:
-        resource_ops[a.resource].append(a)
-
-    for resource_id, ops in resource_ops.items():
-        # Check all pairs for overlap
-        for i in range(len(ops)):
-            for j in range(i + 1, len(ops)):
-                a1, a2 = ops[i], ops[j]
-
-                # Convert to comparable format
-                a1_start = a1.start.timestamp()
-                a1_end = a1.end.timestamp()
-                a2_start = a2.start.timestamp()
-                a2_end = a2.end.timestamp()
-
-                if intervals_overlap(a1_start, a1_end, a2_start, a2_end):
-                    errors.append(
-                        f"Overlap on {resource_id}: {a1.product}/{a1.op} "
-                        f"[{a1.start} - {a1.end}] overlaps with "
-                        f"{a2.product}/{a2.op} [{a2.start} - {a2.end}]"
-                    )
+    records.extend(_overlap_records(arrays))
+    records.extend(_precedence_records(request, arrays, context))
+    records.extend(_calendar_records(request, arrays, context))
+    records.extend(_horizon_records(arrays, context))
 
-    return errors
+    return records
 
 
-def check_precedence(request: ScheduleRequest, assignments: List[Assignment]) -> List[str]:
-    """Verify operations within a product follow route order."""
+def format_errors(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    records: List[ErrorRecord]
+) -> List[str]:
+    """Render error records as human-readable messages."""
     errors = []
 
-    # Group assignments by product
-    product_ops = defaultdict(list)
-    for a in assignments:
-        product_ops[a.product].append(a)
-
-    # Check each product's route
-    for product in request.products:
-        if product.id not in product_ops:
-            continue
+    for code, *idx in records:
+        if code == "overlap":
+            a1, a2 = assignments[idx[0]], assignments[idx[1]]
+            errors.append(
+                f"Overlap on {a2.resource}: {a1.product}/{a1.op} "
+                f"[{a1.start} - {a1.end}] overlaps with "
+                f"{a2.product}/{a2.op} [{a2.start} - {a2.end}]"
+            )
+        elif code == "precedence":
+            p_idx, pos, i, j = idx
+            product = request.products[p_idx]
+            errors.append(
+                f"Precedence violation in {product.id}: "
+                f"{product.route[pos].capability} ends at {assignments[i].end} but "
+                f"{product.route[pos + 1].capability} starts at {assignments[j].start}"
+            )
+        elif code == "unknown_resource":
+            errors.append(f"Assignment references unknown resource: {assignments[idx[0]].resource}")
+        elif code == "calendar":
+            a = assignments[idx[0]]
+            errors.append(
+                f"Calendar violation: {a.product}/{a.op} on {a.resource} "
+                f"[{a.start} - {a.end}] not within working windows"
+            )
+        elif code == "horizon":
+            a = assignments[idx[0]]
+            errors.append(
+                f"Horizon violation: {a.product}/{a.op} "
+                f"[{a.start} - {a.end}] outside horizon "
+                f"[{request.horizon.start} - {request.horizon.end}]"
+            )
+        else:
+            raise ValueError(f"Unknown error record: {code}")
 
-        ops = product_ops[product.id]
+    return errors
 
-        # Build operation lookup by capability
-        op_lookup = {a.op: a for a in ops}
 
-        # Verify precedence according to route
-        for i in range(len(product.route) - 1):
-            curr_cap = product.route[i].capability
-            next_cap = product.route[i + 1].capability
+def check_no_overlap(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    arrays: Optional[Dict[str, np.ndarray]] = None,
+    context: Optional[ValidationContext] = None
+) -> List[str]:
+    """Verify no operations overlap on the same resource."""
+    if arrays is None:
+        arrays = materialize_assignments(request, assignments, context)
 
-            if curr_cap not in op_lookup or next_cap not in op_lookup:
-                continue
+    return format_errors(request, assignments, _overlap_records(arrays))
 
-            curr_assignment = op_lookup[curr_cap]
-            next_assignment = op_lookup[next_cap]
 
-            if curr_assignment.end > next_assignment.start:
-                errors.append(
-                    f"Precedence violation in {product.id}: "
-                    f"{curr_cap} ends at {curr_assignment.end} but "
-                    f"{next_cap} starts at {next_assignment.start}"
-                )
+def check_precedence(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    arrays: Optional[Dict[str, np.ndarray]] = None,
+    context: Optional[ValidationContext] = None
+) -> List[str]:
+    """Verify operations within a product follow route order."""
+    if context is None:
+        context = ValidationContext.from_request(request)
+    if arrays is None:
+        arrays = materialize_assignments(request, assignments, context)
 
-    return errors
+    return format_errors(request, assignments, _precedence_records(request, arrays, context))
 
 
-def check_calendar_compliance(request: ScheduleRequest, assignments: List[Assignment]) -> List[str]:
+def check_calendar_compliance(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    arrays: Optional[Dict[str, np.ndarray]] = None,
+    context: Optional[ValidationContext] = None
+) -> List[str]:
     """Verify all operations fit within resource calendars."""
-    errors = []
-
-    # Build resource lookup
-    resource_lookup = {r.id: r for r in request.resources}
-
-    for a in assignments:
-        resource = resource_lookup.get(a.resource)
-        if not resource:
-            errors.append(f"Assignment references unknown resource: {a.resource}")
-            continue
-
-        # Check if assignment fits in any calendar window
-        fits_in_window = False
-        for window_start, window_end in resource.calendar:
-            if a.start >= window_start and a.end <= window_end:
-                fits_in_window = True
-                break
-
-        if not fits_in_window:
-            errors.append(
-                f"Calendar violation: {a.product}/{a.op} on {a.resource} "
-                f"[{a.start} - {a.end}] not within working windows"
-            )
+    if context is None:
+        context = ValidationContext.from_request(request)
+    if arrays is None:
+        arrays = materialize_assignments(request, assignments, context)
 
-    return errors
+    return format_errors(request, assignments, _calendar_records(request, arrays, context))
 
 
-def check_horizon_bounds(request: ScheduleRequest, assignments: List[Assignment]) -> List[str]:
+def check_horizon_bounds(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    arrays: Optional[Dict[str, np.ndarray]] = None,
+    context: Optional[ValidationContext] = None
+) -> List[str]:
     """Verify all times are within the horizon."""
-    errors = []
-
-    for a in assignments:
-        if a.start < request.horizon.start or a.end > request.horizon.end:
-            errors.append(
-                f"Horizon violation: {a.product}/{a.op} "
-                f"[{a.start} - {a.end}] outside horizon "
-                f"[{request.horizon.start} - {request.horizon.end}]"
-            )
-
-    return errors
+    if context is None:
+        context = ValidationContext.from_request(request)
+    if arrays is None:
+        arrays = materialize_assignments(request, assignments, context)
+
+    return format_errors(request, assignments, _horizon_records(arrays, context))
+
+
+def _overlap_records(arrays: Dict[str, np.ndarray]) -> List[ErrorRecord]:
+    grouped = (arrays["starts"], arrays["ends"], arrays["by_res"], arrays["res_bounds"])
+
+    # Linear running-max sweep first; pairs are only enumerated when
+    # something actually overlaps
+    if overlap_candidates(*grouped).size == 0:
+        return []
+
+    pairs = overlap_pairs(*grouped)
+    return [("overlap", i, j) for i, j in pairs.tolist()]
+
+
+def _precedence_records(
+    request: ScheduleRequest,
+    arrays: Dict[str, np.ndarray],
+    context: ValidationContext
+) -> List[ErrorRecord]:
+    num_products = len(request.products)
+    num_caps = len(context.capability_lookup)
+    prod = arrays["prod"]
+    op = arrays["op"]
+
+    # (product, capability) -> assignment index; where one product has
+    # several assignments for a capability the last one counts. Unique over
+    # the reversed order keeps each key's last occurrence.
+    mapped = np.flatnonzero((prod < num_products) & (op >= 0))
+    keys = prod[mapped].astype(np.int64) * num_caps + op[mapped]
+    uniq, first_in_reversed = np.unique(keys[::-1], return_index=True)
+    step_assignment = np.full(num_products * num_caps, -1, dtype=np.int64)
+    step_assignment[uniq] = mapped[::-1][first_in_reversed]
+
+    # Assignments of both steps of every route pair; products resolve by id
+    base = context.product_group[context.route_pairs[:, 0]] * num_caps
+    curr_idx = step_assignment[base + context.route_pair_caps[:, 0]]
+    next_idx = step_assignment[base + context.route_pair_caps[:, 1]]
+
+    violations = precedence_violations(arrays["starts"], arrays["ends"], curr_idx, next_idx)
+
+    return [
+        ("precedence", p_idx, pos, i, j)
+        for (p_idx, pos), i, j in zip(
+            context.route_pairs[violations].tolist(),
+            curr_idx[violations].tolist(),
+            next_idx[violations].tolist()
+        )
+    ]
+
+
+def _calendar_records(
+    request: ScheduleRequest,
+    arrays: Dict[str, np.ndarray],
+    context: ValidationContext
+) -> List[ErrorRecord]:
+    unknown = arrays["res"] >= len(request.resources)
+    violation = calendar_violations(
+        arrays["starts"], arrays["ends"], arrays["by_res"], arrays["res_bounds"],
+        context.cal_offsets, context.cal_starts, context.cal_reach
+    )
+
+    # In assignment order, unknown resources reported in place
+    return [
+        ("unknown_resource", k) if unknown[k] else ("calendar", k)
+        for k in np.flatnonzero(unknown | violation).tolist()
+    ]
+
+
+def _horizon_records(arrays: Dict[str, np.ndarray], context: ValidationContext) -> List[ErrorRecord]:
+    outside = (
+        (arrays["starts"] < context.horizon_start_us)
+        | (arrays["ends"] > context.horizon_end_us)
+    )
+    return [("horizon", i) for i in np.flatnonzero(outside).tolist()]
@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..models.cdm import ScheduleRequest, Assignment
+from ..utils.time_utils import to_epoch_us
+
+
+@dataclass(frozen=True)
+class ValidationContext:
+    """
+    Lookups derived from a ScheduleRequest, built once per request.
+
+    validate_schedule and calculate_kpis both accept a context, so callers
+    that run both (e.g. validate_schedule.py) share one instead of every
+    check rebuilding its own id dicts and calendar arrays. A context from
+    prepare() also carries the assignment arrays, which are reused for
+    that same assignment list.
+
+    Product lookups by id follow the last product with that id.
+    """
+    request: ScheduleRequest
+    # Resource id -> index into request.resources
+    resource_lookup: Dict[str, int]
+    # Per resource index, the index its id resolves to through resource_lookup
+    resource_group: np.ndarray
+    # Product id -> index into request.products
+    product_lookup: Dict[str, int]
+    # Per product index, the index its id resolves to through product_lookup
+    product_group: np.ndarray
+    # Capability -> small int code, over all route capabilities
+    capability_lookup: Dict[str, int]
+    # Family code per product index, -1 for no family; one trailing -1 slot
+    # for products outside the request
+    family_lookup: np.ndarray
+    # Route capabilities per product index
+    product_route_lookup: List[Tuple[str, ...]]
+    # One row per consecutive pair of route steps, in product then route
+    # order: (product index, position of the earlier step) and the
+    # capability codes of (earlier step, later step)
+    route_pairs: np.ndarray
+    route_pair_caps: np.ndarray
+    # Due time per product index, epoch microseconds
+    due_us: np.ndarray
+    # Calendar windows of all resources, flattened: resource r owns
+    # positions cal_offsets[r]:cal_offsets[r + 1]. Within a resource,
+    # cal_starts is sorted and cal_reach is the running max of the window
+    # ends in that order (epoch microseconds).
+    cal_offsets: np.ndarray
+    cal_starts: np.ndarray
+    cal_reach: np.ndarray
+    # Total length of the calendar windows per resource index, microseconds
+    cal_available_us: np.ndarray
+    horizon_start_us: int
+    horizon_end_us: int
+    # Set by prepare(): the assignment list and its materialized arrays
+    assignments: Optional[List[Assignment]] = None
+    arrays: Optional[Dict[str, np.ndarray]] = None
+
+    @classmethod
+    def from_request(cls, request: ScheduleRequest) -> "ValidationContext":
+        num_products = len(request.products)
+
+        family_codes = {}
+        family_lookup = np.full(num_products + 1, -1, dtype=np.int32)
+        for idx, p in enumerate(request.products):
+            if p.family:
+                family_lookup[idx] = family_codes.setdefault(p.family, len(family_codes))
+
+        product_lookup = {p.id: idx for idx, p in enumerate(request.products)}
+        routes = [tuple(op.capability for op in p.route) for p in request.products]
+
+        capability_lookup = {}
+        route_pairs = []
+        route_pair_caps = []
+        for idx, route in enumerate(routes):
+            codes = [capability_lookup.setdefault(cap, len(capability_lookup)) for cap in route]
+            for pos in range(len(route) - 1):
+                route_pairs.append((idx, pos))
+                route_pair_caps.append((codes[pos], codes[pos + 1]))
+
+        num_resources = len(request.resources)
+        resource_lookup = {r.id: idx for idx, r in enumerate(request.resources)}
+
+        # Calendars come pre-converted and ordered from each Resource
+        cal_offsets = np.zeros(num_resources + 1, dtype=np.int64)
+        cal_starts = []
+        cal_ends = []
+        cal_reach = []
+        for idx, resource in enumerate(request.resources):
+            starts, ends, reach = resource.calendar_us
+            cal_offsets[idx + 1] = cal_offsets[idx] + len(starts)
+            cal_starts.extend(starts)
+            cal_ends.extend(ends)
+            cal_reach.extend(reach)
+
+        cal_starts = np.array(cal_starts, dtype=np.int64)
+        cal_ends = np.array(cal_ends, dtype=np.int64)
+
+        # Owning resource of each flattened window, to total lengths per resource
+        cal_res = np.repeat(np.arange(num_resources), np.diff(cal_offsets))
+
+        return cls(
+            request=request,
+            resource_lookup=resource_lookup,
+            resource_group=np.fromiter(
+                (resource_lookup[r.id] for r in request.resources), dtype=np.int64, count=num_resources
+            ),
+            product_lookup=product_lookup,
+            product_group=np.fromiter(
+                (product_lookup[p.id] for p in request.products), dtype=np.int64, count=num_products
+            ),
+            capability_lookup=capability_lookup,
+            family_lookup=family_lookup,
+            product_route_lookup=routes,
+            route_pairs=np.array(route_pairs, dtype=np.int64).reshape(-1, 2),
+            route_pair_caps=np.array(route_pair_caps, dtype=np.int64).reshape(-1, 2),
+            due_us=np.fromiter(
+                (to_epoch_us(p.due) for p in request.products), dtype=np.int64, count=num_products
+            ),
+            cal_offsets=cal_offsets,
+            cal_starts=cal_starts,
+            cal_reach=np.array(cal_reach, dtype=np.int64),
+            cal_available_us=np.bincount(
+                cal_res, weights=cal_ends - cal_starts, minlength=num_resources
+            ),
+            horizon_start_us=to_epoch_us(request.horizon.start),
+            horizon_end_us=to_epoch_us(request.horizon.end),
+        )
@@ -0,0 +1,136 @@
+from collections import defaultdict
+from itertools import count
+from typing import Dict, List, Tuple
+
+from ..models.cdm import ScheduleRequest, Assignment
+from ..utils.interval_tree import IntervalTree
+from ..utils.time_utils import to_epoch_us
+from .checkers import validate_schedule, format_errors
+from .context import ValidationContext
+
+
+class IncrementalValidator:
+    """
+    Validate a schedule one assignment at a time.
+
+    Keeps an interval tree per resource and the latest assignment per
+    (product, capability), so add() checks a new assignment against the
+    ones already placed in O(log n + conflicts) instead of re-running the
+    full validation. Messages match validate_schedule; snapshot() runs the
+    full checks over the current assignments.
+    """
+
+    def __init__(self, request: ScheduleRequest):
+        self.request = request
+        self._context = ValidationContext.from_request(request)
+        self._resources = {r.id: r for r in request.resources}
+        self._products_by_id: Dict[str, List[int]] = defaultdict(list)
+        for idx, p in enumerate(request.products):
+            self._products_by_id[p.id].append(idx)
+
+        self._seq = count()
+        # seq -> (assignment, start_us, end_us), in insertion order
+        self._live: Dict[int, Tuple[Assignment, int, int]] = {}
+        # assignment -> seqs of its live copies
+        self._seqs: Dict[Assignment, List[int]] = defaultdict(list)
+        self._trees: Dict[str, IntervalTree] = defaultdict(IntervalTree)
+        self._tree_keys: Dict[int, Tuple[int, int]] = {}
+        # (product, capability) -> seqs of live assignments, latest last
+        self._steps: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    @property
+    def assignments(self) -> List[Assignment]:
+        """Current assignments in insertion order."""
+        return [a for a, _, _ in self._live.values()]
+
+    def add(self, a: Assignment) -> Tuple[bool, List[str]]:
+        """
+        Add an assignment and report the violations it introduces.
+
+        The assignment is kept even when it conflicts, so it can be
+        removed again with remove().
+
+        Returns:
+            Tuple of (no new violations, error messages)
+        """
+        start, end = to_epoch_us(a.start), to_epoch_us(a.end)
+        # Assignments referenced by records: a is index 0
+        involved = [a]
+        records = []
+
+        for other_seq in self._trees[a.resource].query(start, end):
+            other, other_start, _ = self._live[other_seq]
+            involved.append(other)
+            # Earlier start first, as the batch check reports it
+            if other_start <= start:
+                records.append(("overlap", len(involved) - 1, 0))
+            else:
+                records.append(("overlap", 0, len(involved) - 1))
+
+        # Route pairs touching a's capability; a becomes the latest
+        # assignment for that step, so it stands in for it on both sides
+        for p_idx in self._products_by_id.get(a.product, ()):
+            route = self._context.product_route_lookup[p_idx]
+            for pos in range(len(route) - 1):
+                sides = []
+                for cap in route[pos:pos + 2]:
+                    if cap == a.op:
+                        sides.append((0, start, end))
+                        continue
+                    latest = self._latest(a.product, cap)
+                    if latest is None:
+                        break
+                    other, other_start, other_end = latest
+                    involved.append(other)
+                    sides.append((len(involved) - 1, other_start, other_end))
+                if len(sides) < 2 or all(i != 0 for i, _, _ in sides):
+                    continue
+                (curr, _, curr_end), (nxt, nxt_start, _) = sides
+                if curr_end > nxt_start:
+                    records.append(("precedence", p_idx, pos, curr, nxt))
+
+        resource = self._resources.get(a.resource)
+        if resource is None:
+            records.append(("unknown_resource", 0))
+        elif not resource.fits(start, end):
+            records.append(("calendar", 0))
+
+        if start < self._context.horizon_start_us or end > self._context.horizon_end_us:
+            records.append(("horizon", 0))
+
+        seq = next(self._seq)
+        self._live[seq] = (a, start, end)
+        self._seqs[a].append(seq)
+        self._tree_keys[seq] = self._trees[a.resource].insert(start, end, seq)
+        self._steps[(a.product, a.op)].append(seq)
+
+        return len(records) == 0, format_errors(self.request, involved, records)
+
+    def remove(self, a: Assignment):
+        """
+        Remove the most recently added copy of an assignment.
+
+        Raises:
+            KeyError: If the assignment was not added
+        """
+        seqs = self._seqs.get(a)
+        if not seqs:
+            raise KeyError(a)
+        seq = seqs.pop()
+        del self._live[seq]
+        self._trees[a.resource].remove(self._tree_keys.pop(seq))
+        self._steps[(a.product, a.op)].remove(seq)
+
+    def snapshot(self) -> Tuple[bool, List[str]]:
+        """Fully validate the current assignments."""
+        return validate_schedule(self.request, self.assignments, self._context)
+
+    def _latest(self, product: str, capability: str):
+        """Latest live (assignment, start_us, end_us) for a product step."""
+        seqs = self._steps.get((product, capability))
+        if not seqs:
+            return None
+        return self._live[seqs[-1]]
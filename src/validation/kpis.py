@@ -1,33 +1,38 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+
+import numpy as np
 
 from ..models.cdm import ScheduleRequest, Assignment, KPIs
-from ..utils.time_utils import to_minutes
+from ..utils.time_utils import to_minutes, US_PER_MINUTE
+from .arrays import materialize_assignments
+from .context import ValidationContext
 
 
-def calculate_kpis(request: ScheduleRequest, assignments: List[Assignment]) -> KPIs:
+def calculate_kpis(
+    request: ScheduleRequest,
+    assignments: List[Assignment],
+    context: Optional[ValidationContext] = None
+) -> KPIs:
     """Calculate all KPIs from the schedule."""
 
-    # Organize assignments by product and resource
-    product_assignments = defaultdict(list)
-    resource_assignments = defaultdict(list)
+    if context is None:
+        context = ValidationContext.from_request(request)
 
-    for a in assignments:
-        product_assignments[a.product].append(a)
-        resource_assignments[a.resource].append(a)
+    # Int arrays shared by the vectorized KPIs
+    arrays = materialize_assignments(request, assignments, context)
 
     # Calculate tardiness
-    tardiness_minutes = _calculate_tardiness(request, product_assignments)
+    tardiness_minutes = _calculate_tardiness(context, arrays)
 
     # Count changeovers
-    changeovers = _count_changeovers(request, resource_assignments)
+    changeovers = _count_changeovers(context, arrays)
 
     # Calculate makespan
-    makespan_minutes = _calculate_makespan(request, assignments)
+    makespan_minutes = _calculate_makespan(request, arrays)
 
     # Calculate utilization per resource
-    utilization = _calculate_utilization(request, resource_assignments)
+    utilization = _calculate_utilization(context, arrays)
 
     return KPIs(
         tardiness_minutes=tardiness_minutes,
@@ -38,90 +43,95 @@ def calculate_kpis(request: ScheduleRequest, assignments: List[Assignment]) -> K
 
 
 def _calculate_tardiness(
-    request: ScheduleRequest,
-    product_assignments: Dict[str, List[Assignment]]
+    context: ValidationContext,
+    arrays: Dict[str, np.ndarray]
 ) -> int:
     """Calculate total tardiness across all products."""
-    total_tardiness = 0
-
-    for product in request.products:
-        if product.id not in product_assignments:
-            continue
-
-        # Find completion time (end of last operation)
-        ops = product_assignments[product.id]
-        completion_time = max(a.end for a in ops)
-
-        # Calculate tardiness
-        if completion_time > product.due:
-            delta = completion_time - product.due
-            total_tardiness += int(delta.total_seconds() / 60)
+    request = context.request
+    prod = arrays["prod"]
+    if prod.size == 0:
+        return 0
 
-    return total_tardiness
+    # Completion time per product index: max of ends per product group
+    order = arrays["by_prod"]
+    sorted_prod = prod[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_prod[1:] != sorted_prod[:-1]])
+    group_completion = np.maximum.reduceat(arrays["ends"][order], group_starts)
+
+    # Products without assignments never complete, so they are never late
+    completion = np.zeros(len(request.products), dtype=np.int64)
+    completed = np.zeros(len(request.products), dtype=bool)
+    group_prod = sorted_prod[group_starts]
+    known = group_prod < len(request.products)
+    completion[group_prod[known]] = group_completion[known]
+    completed[group_prod[known]] = True
+
+    # Lookups by id follow the last product with that id
+    product_idx = context.product_group
+
+    late_us = np.where(
+        completed[product_idx], np.maximum(completion[product_idx] - context.due_us, 0), 0
+    )
+    return int((late_us // US_PER_MINUTE).sum())
 
 
 def _count_changeovers(
-    request: ScheduleRequest,
-    resource_assignments: Dict[str, List[Assignment]]
+    context: ValidationContext,
+    arrays: Dict[str, np.ndarray]
 ) -> int:
     """Count the number of family changeovers."""
-    changeover_count = 0
-
-    # Build product family lookup
-    product_families = {p.id: p.family for p in request.products}
-
-    for resource_id, ops in resource_assignments.items():
-        # Sort by start time
-        sorted_ops = sorted(ops, key=lambda x: x.start)
-
-        # Count transitions between different families
-        for i in range(len(sorted_ops) - 1):
-            curr_family = product_families.get(sorted_ops[i].product)
-            next_family = product_families.get(sorted_ops[i + 1].product)
-
-            if curr_family and next_family and curr_family != next_family:
-                changeover_count += 1
+    res = arrays["res"]
+    if res.size < 2:
+        return 0
 
-    return changeover_count
+    # Family code per assignment; ids outside the request all map to the
+    # trailing -1 slot, as do products without a family
+    num_products = len(context.family_lookup) - 1
+    family = context.family_lookup[np.minimum(arrays["prod"], num_products)]
+
+    # Ordered by (resource, start); stable, so ties keep input order
+    order = arrays["by_res"]
+    res_sorted = res[order]
+    family_sorted = family[order]
+
+    # Consecutive ops on one resource with two known, different families
+    transitions = (
+        (res_sorted[1:] == res_sorted[:-1])
+        & (family_sorted[1:] != family_sorted[:-1])
+        & (family_sorted[1:] >= 0)
+        & (family_sorted[:-1] >= 0)
+    )
+    return int(transitions.sum())
 
 
-def _calculate_makespan(request: ScheduleRequest, assignments: List[Assignment]) -> int:
+def _calculate_makespan(request: ScheduleRequest, arrays: Dict[str, np.ndarray]) -> int:
     """Calculate makespan (total schedule duration)."""
-    if not assignments:
+    if arrays["starts"].size == 0:
         return 0
 
-    earliest_start = min(a.start for a in assignments)
-    latest_end = max(a.end for a in assignments)
-
-    delta = latest_end - earliest_start
-    return int(delta.total_seconds() / 60)
+    delta_us = int(arrays["ends"].max()) - int(arrays["starts"].min())
+    return int(delta_us / US_PER_MINUTE)
 
 
 def _calculate_utilization(
-    request: ScheduleRequest,
-    resource_assignments: Dict[str, List[Assignment]]
+    context: ValidationContext,
+    arrays: Dict[str, np.ndarray]
 ) -> Dict[str, int]:
     """Calculate utilization percentage for each resource."""
-    utilization = {}
-
-    # Calculate total available time per resource
-    for resource in request.resources:
-        total_available = 0
-        for start_dt, end_dt in resource.calendar:
-            delta = end_dt - start_dt
-            total_available += delta.total_seconds() / 60
-
-        # Calculate busy time
-        busy_time = 0
-        if resource.id in resource_assignments:
-            for a in resource_assignments[resource.id]:
-                delta = a.end - a.start
-                busy_time += delta.total_seconds() / 60
-
-        # Calculate percentage
-        if total_available > 0:
-            utilization[resource.id] = int((busy_time / total_available) * 100)
-        else:
-            utilization[resource.id] = 0
-
-    return utilization
+    resources = context.request.resources
+
+    # Busy time per resource index; ops on unknown resources land past the end
+    busy = np.bincount(
+        arrays["res"], weights=arrays["ends"] - arrays["starts"], minlength=len(resources)
+    )
+    # Resources sharing an id all see the assignments made to that id
+    busy_minutes = busy[context.resource_group] / US_PER_MINUTE
+    available_minutes = context.cal_available_us / US_PER_MINUTE
+
+    # Percentage, 0 where a resource has no available time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent = np.where(
+            available_minutes > 0, busy_minutes / available_minutes * 100, 0
+        ).astype(np.int64)
+
+    return {resource.id: int(u) for resource, u in zip(resources, percent)}
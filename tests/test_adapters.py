@@ -1,17 +1,16 @@
 import pytest
-import json
 from pathlib import Path
 from src.adapters.factory import AdapterFactory
 from src.adapters.client_a import ClientAAdapter
 from src.adapters.client_b import ClientBAdapter
 from src.solver.engine import solve_schedule
+from src.utils.jsonio import load_json
 
 
 def test_client_a_adapter():
     """Test that Client A adapter works with original format."""
     sample_path = Path(__file__).parent.parent / "examples" / "sample_input.json"
-    with open(sample_path) as f:
-        data = json.load(f)
+    data = load_json(sample_path)
 
     adapter = ClientAAdapter()
     request = adapter.to_cdm(data)
@@ -24,8 +23,7 @@ def test_client_a_adapter():
 def test_client_b_adapter():
     """Test that Client B adapter transforms legacy format correctly."""
     sample_path = Path(__file__).parent.parent / "examples" / "client_b_input.json"
-    with open(sample_path) as f:
-        data = json.load(f)
+    data = load_json(sample_path)
 
     adapter = ClientBAdapter()
     request = adapter.to_cdm(data)
@@ -61,6 +59,18 @@ def test_client_b_adapter():
     assert request.changeover_matrix_minutes.values["standard->premium"] == 20
 
 
+def test_client_b_deadline_hour_floors_to_minute():
+    """Test that deadline_hour is truncated to whole minutes, never rounded up."""
+    sample_path = Path(__file__).parent.parent / "examples" / "client_b_input.json"
+    data = load_json(sample_path)
+
+    adapter = ClientBAdapter()
+    for deadline_hour, hour, minute in [(23.995, 23, 59), (16.9, 16, 54), (15.1, 15, 6)]:
+        data["orders"][0]["deadline_hour"] = deadline_hour
+        due = adapter.to_cdm(data).products[0].due
+        assert (due.day, due.hour, due.minute) == (3, hour, minute)
+
+
 def test_adapter_factory_explicit():
     """Test factory with explicit client_id."""
     factory = AdapterFactory()
@@ -90,12 +100,16 @@ def test_adapter_factory_auto_detect():
     adapter = factory.get_adapter(client_b_data)
     assert isinstance(adapter, ClientBAdapter)
 
+    # Both fingerprints present: Client B wins, as it always has
+    both_data = {"horizon": {}, "products": [], "shift_window": "", "orders": []}
+    adapter = factory.get_adapter(both_data)
+    assert isinstance(adapter, ClientBAdapter)
+
 
 def test_client_b_end_to_end():
     """Test that Client B input can be solved successfully."""
     sample_path = Path(__file__).parent.parent / "examples" / "client_b_input.json"
-    with open(sample_path) as f:
-        data = json.load(f)
+    data = load_json(sample_path)
 
     factory = AdapterFactory()
     adapter = factory.get_adapter(data)
@@ -116,3 +130,29 @@ def test_unknown_client():
 
     with pytest.raises(ValueError, match="Unable to detect"):
         factory.get_adapter({"unknown": "format"})
+
+    # A JSON body that isn't an object
+    for raw_input in ([1, 2], "client_id", None):
+        with pytest.raises(ValueError, match="Unable to detect"):
+            factory.get_adapter(raw_input)
+
+
+def test_register_adapter_with_required_keys():
+    """Test that a registered adapter is auto-detected by its required keys."""
+
+    class ClientCAdapter(ClientAAdapter):
+        required_keys = frozenset({"jobs", "window"})
+
+        @property
+        def client_id(self) -> str:
+            return "client_c"
+
+    factory = AdapterFactory()
+    client_c = ClientCAdapter()
+    factory.register_adapter(client_c)
+
+    adapter = factory.get_adapter({"jobs": [], "window": {}, "extra": 1})
+    assert adapter is client_c
+
+    # Explicit routing also works for the new client
+    assert factory.get_adapter({"client_id": "client_c"}) is client_c
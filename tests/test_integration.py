@@ -1,17 +1,16 @@
 import pytest
-import json
 from pathlib import Path
 from src.models.cdm import ScheduleRequest, ScheduleResponse
 from src.solver.engine import solve_schedule
 from src.validation.checkers import validate_schedule
+from src.utils.jsonio import load_json
 
 
 def test_sample_input_solves():
     """Test that the sample input produces a valid schedule."""
     # Load sample input
     sample_path = Path(__file__).parent.parent / "examples" / "sample_input.json"
-    with open(sample_path) as f:
-        data = json.load(f)
+    data = load_json(sample_path)
 
     request = ScheduleRequest(**data)
     result = solve_schedule(request)
@@ -68,5 +67,45 @@ def test_infeasible_schedule():
     assert len(result.why) > 0
 
 
+def test_operation_skips_too_short_window():
+    """Test that an operation is placed in a calendar window long enough to hold it."""
+    data = {
+        "horizon": {
+            "start": "2025-11-03T08:00:00",
+            "end": "2025-11-03T16:00:00"
+        },
+        "resources": [
+            {
+                "id": "R1",
+                "capabilities": ["fill"],
+                "calendar": [
+                    ["2025-11-03T08:00:00", "2025-11-03T08:30:00"],
+                    ["2025-11-03T09:00:00", "2025-11-03T16:00:00"]
+                ]
+            }
+        ],
+        "changeover_matrix_minutes": {"values": {}},
+        "products": [
+            {
+                "id": "P1",
+                "family": "standard",
+                "due": "2025-11-03T09:00:00",
+                "route": [{"capability": "fill", "duration_minutes": 60}]
+            }
+        ],
+        "settings": {"time_limit_seconds": 5}
+    }
+
+    request = ScheduleRequest(**data)
+    result = solve_schedule(request)
+
+    assert isinstance(result, ScheduleResponse)
+    assert result.assignments[0].start.hour == 9
+    assert result.kpis.tardiness_minutes == 60
+
+    is_valid, errors = validate_schedule(request, result.assignments)
+    assert is_valid, f"Schedule failed validation: {errors}"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
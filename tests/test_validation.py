@@ -294,3 +294,377 @@ def test_calendar_violation():
     errors = check_calendar_compliance(request, assignments)
     assert len(errors) > 0
     assert "Calendar violation" in errors[0]
+
+
+def test_overlap_with_earlier_long_operation():
+    """Test that an op overlapping a long earlier op is caught even if its neighbour doesn't overlap."""
+    horizon = Horizon(
+        start=datetime(2025, 11, 3, 8, 0),
+        end=datetime(2025, 11, 3, 16, 0)
+    )
+
+    resources = [
+        Resource(
+            id="R1",
+            capabilities=["fill"],
+            calendar=[(datetime(2025, 11, 3, 8, 0), datetime(2025, 11, 3, 16, 0))]
+        )
+    ]
+
+    products = [
+        Product(
+            id="P1",
+            family="standard",
+            due=datetime(2025, 11, 3, 12, 0),
+            route=[Operation(capability="fill", duration_minutes=120)]
+        )
+    ]
+
+    request = ScheduleRequest(
+        horizon=horizon,
+        resources=resources,
+        products=products,
+        changeover_matrix_minutes=ChangeoverMatrix(),
+        settings=Settings()
+    )
+
+    # P1 spans 8:00-10:00; P2 sits inside it; P3 starts after P2 but still inside P1
+    assignments = [
+        Assignment(
+            product="P3",
+            op="fill",
+            resource="R1",
+            start=datetime(2025, 11, 3, 9, 0),
+            end=datetime(2025, 11, 3, 9, 30)
+        ),
+        Assignment(
+            product="P1",
+            op="fill",
+            resource="R1",
+            start=datetime(2025, 11, 3, 8, 0),
+            end=datetime(2025, 11, 3, 10, 0)
+        ),
+        Assignment(
+            product="P2",
+            op="fill",
+            resource="R1",
+            start=datetime(2025, 11, 3, 8, 15),
+            end=datetime(2025, 11, 3, 8, 45)
+        )
+    ]
+
+    errors = check_no_overlap(request, assignments)
+    assert len(errors) == 2
+    assert all("P1/fill" in err for err in errors)
+
+
+def test_interval_tree_query_and_remove():
+    """Test interval tree overlap queries, including after removal."""
+    from src.utils.interval_tree import IntervalTree
+
+    tree = IntervalTree()
+    keys = {
+        name: tree.insert(start, end, name)
+        for name, start, end in [("a", 0, 100), ("b", 10, 20), ("c", 30, 40), ("d", 100, 110)]
+    }
+
+    assert tree.query(15, 35) == ["a", "b", "c"]
+    assert tree.query(100, 105) == ["d"]  # half-open: "a" ends at 100
+    assert tree.query(200, 300) == []
+
+    tree.remove(keys["a"])
+    assert len(tree) == 3
+    assert tree.query(15, 35) == ["b", "c"]
+
+    with pytest.raises(KeyError):
+        tree.remove(keys["a"])
+
+
+def test_violation_records_format_lazily():
+    """Test that error records render to the same messages as validate_schedule."""
+    from src.validation.checkers import find_violations, format_errors, validate_schedule
+
+    horizon = Horizon(
+        start=datetime(2025, 11, 3, 8, 0),
+        end=datetime(2025, 11, 3, 16, 0)
+    )
+
+    resources = [
+        Resource(
+            id="R1",
+            capabilities=["fill"],
+            calendar=[(datetime(2025, 11, 3, 8, 0), datetime(2025, 11, 3, 12, 0))]
+        )
+    ]
+
+    products = [
+        Product(
+            id="P1",
+            family="standard",
+            due=datetime(2025, 11, 3, 12, 0),
+            route=[Operation(capability="fill", duration_minutes=30)]
+        )
+    ]
+
+    request = ScheduleRequest(
+        horizon=horizon,
+        resources=resources,
+        products=products,
+        changeover_matrix_minutes=ChangeoverMatrix(),
+        settings=Settings()
+    )
+
+    assignments = [
+        Assignment(
+            product="P1",
+            op="fill",
+            resource="R1",
+            start=datetime(2025, 11, 3, 11, 45),  # Runs past the window
+            end=datetime(2025, 11, 3, 12, 15)
+        ),
+        Assignment(
+            product="P1",
+            op="fill",
+            resource="R2",  # Unknown resource
+            start=datetime(2025, 11, 3, 9, 0),
+            end=datetime(2025, 11, 3, 9, 30)
+        )
+    ]
+
+    records = find_violations(request, assignments)
+    assert records == [("calendar", 0), ("unknown_resource", 1)]
+
+    is_valid, errors = validate_schedule(request, assignments)
+    assert not is_valid
+    assert format_errors(request, assignments, records) == errors
+    assert "Calendar violation" in errors[0]
+    assert "unknown resource: R2" in errors[1]
+
+
+def test_resource_fits_overlapping_windows():
+    """Test Resource.fits against unordered, nested calendar windows."""
+    from src.utils.time_utils import to_epoch_us
+
+    resource = Resource(
+        id="R1",
+        capabilities=["fill"],
+        calendar=[
+            (datetime(2025, 11, 3, 13, 0), datetime(2025, 11, 3, 16, 0)),
+            (datetime(2025, 11, 3, 8, 0), datetime(2025, 11, 3, 12, 0)),
+            (datetime(2025, 11, 3, 9, 0), datetime(2025, 11, 3, 10, 0)),  # Nested
+        ]
+    )
+
+    def fits(start_hour, end_hour):
+        return resource.fits(
+            to_epoch_us(datetime(2025, 11, 3, start_hour, 0)),
+            to_epoch_us(datetime(2025, 11, 3, end_hour, 0))
+        )
+
+    assert fits(10, 12)  # Inside the outer window, after the nested one
+    assert fits(13, 16)
+    assert not fits(11, 14)  # Spans the break
+    assert not fits(7, 9)  # Before the first window
+
+    # A copy with a new calendar must not reuse the old derived windows
+    resource = resource.model_copy(
+        update={"calendar": ((datetime(2025, 11, 3, 6, 0), datetime(2025, 11, 3, 9, 0)),)}
+    )
+    assert fits(7, 9)
+    assert not fits(10, 12)
+    assert resource == Resource(id="R1", capabilities=["fill"], calendar=resource.calendar)
+
+
+def test_changeover_matrix_model_copy():
+    """Test that a copy with new values looks up the new changeover times."""
+    matrix = ChangeoverMatrix(values={"a->b": 5})
+    assert matrix.get_changeover_time("a", "b") == 5
+
+    matrix = matrix.model_copy(update={"values": {"a->b": 99, "x->y": 3}})
+    assert matrix.get_changeover_time("a", "b") == 99
+    assert matrix.get_changeover_time("x", "y") == 3
+    assert matrix == ChangeoverMatrix(values={"a->b": 99, "x->y": 3})
+
+
+def test_incremental_validator_add_remove():
+    """Test that incremental checks report new conflicts and agree with a full run."""
+    from src.validation.incremental import IncrementalValidator
+
+    horizon = Horizon(
+        start=datetime(2025, 11, 3, 8, 0),
+        end=datetime(2025, 11, 3, 16, 0)
+    )
+
+    resources = [
+        Resource(
+            id="R1",
+            capabilities=["fill", "label"],
+            calendar=[(datetime(2025, 11, 3, 8, 0), datetime(2025, 11, 3, 16, 0))]
+        )
+    ]
+
+    products = [
+        Product(
+            id="P1",
+            family="standard",
+            due=datetime(2025, 11, 3, 12, 0),
+            route=[
+                Operation(capability="fill", duration_minutes=30),
+                Operation(capability="label", duration_minutes=30)
+            ]
+        )
+    ]
+
+    request = ScheduleRequest(
+        horizon=horizon,
+        resources=resources,
+        products=products,
+        changeover_matrix_minutes=ChangeoverMatrix(),
+        settings=Settings()
+    )
+
+    fill = Assignment(
+        product="P1",
+        op="fill",
+        resource="R1",
+        start=datetime(2025, 11, 3, 8, 0),
+        end=datetime(2025, 11, 3, 8, 30)
+    )
+    early_label = Assignment(
+        product="P1",
+        op="label",
+        resource="R1",
+        start=datetime(2025, 11, 3, 8, 15),  # Overlaps fill and starts before it ends
+        end=datetime(2025, 11, 3, 8, 45)
+    )
+
+    validator = IncrementalValidator(request)
+    assert validator.add(fill) == (True, [])
+
+    ok, errors = validator.add(early_label)
+    assert not ok
+    assert len(errors) == 2
+    assert "Overlap on R1" in errors[0]
+    assert "Precedence violation in P1" in errors[1]
+    assert validator.snapshot() == (False, errors)
+
+    validator.remove(early_label)
+    assert len(validator) == 1
+    assert validator.snapshot() == (True, [])
+
+    with pytest.raises(KeyError):
+        validator.remove(early_label)
+
+
+def test_struct_array_matches_assignments():
+    """Test packing assignments into the structured record array."""
+    from src.validation.arrays import ASSIGNMENT_DTYPE, to_struct_array
+    from src.utils.time_utils import to_epoch_us
+
+    request = ScheduleRequest(
+        horizon=Horizon(
+            start=datetime(2025, 11, 3, 8, 0),
+            end=datetime(2025, 11, 3, 16, 0)
+        ),
+        resources=[
+            Resource(
+                id="R1",
+                capabilities=["fill"],
+                calendar=[(datetime(2025, 11, 3, 8, 0), datetime(2025, 11, 3, 16, 0))]
+            )
+        ],
+        products=[
+            Product(
+                id="P1",
+                family="standard",
+                due=datetime(2025, 11, 3, 12, 0),
+                route=[Operation(capability="fill", duration_minutes=30)]
+            )
+        ],
+        changeover_matrix_minutes=ChangeoverMatrix(),
+        settings=Settings()
+    )
+
+    assignments = [
+        Assignment(
+            product="P1",
+            op="fill",
+            resource="R1",
+            start=datetime(2025, 11, 3, 8, 0),
+            end=datetime(2025, 11, 3, 8, 30)
+        ),
+        Assignment(
+            product="P9",  # Unknown product
+            op="pack",  # Capability no route uses
+            resource="R1",
+            start=datetime(2025, 11, 3, 9, 0),
+            end=datetime(2025, 11, 3, 9, 30)
+        )
+    ]
+
+    records = to_struct_array(request, assignments)
+    assert records.dtype == ASSIGNMENT_DTYPE
+    assert records["start"].tolist() == [to_epoch_us(a.start) for a in assignments]
+    assert records["end"].tolist() == [to_epoch_us(a.end) for a in assignments]
+    assert records["res"].tolist() == [0, 0]
+    assert records["prod"].tolist() == [0, 1]
+    assert records["op"].tolist() == [0, -1]
+
+
+def _random_kernel_inputs(seed):
+    """Arrays shaped like materialize_assignments / ValidationContext output."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    num_ops, num_res = 60, 4
+    # Coarse times, so ops and windows often touch exactly at their ends
+    starts = rng.integers(0, 50, num_ops) * 10
+    ends = starts + rng.integers(1, 6, num_ops) * 10
+    res = rng.integers(0, num_res, num_ops)
+
+    # Per resource: a few windows, unordered by end so cal_reach matters
+    windows = [np.sort(rng.integers(0, 56, (rng.integers(0, 4), 2)) * 10, axis=1) for _ in range(num_res)]
+    windows = [w[np.argsort(w[:, 0], kind="stable")] for w in windows]
+    cal_offsets = np.concatenate([[0], np.cumsum([len(w) for w in windows])])
+    cal_starts = np.concatenate([w[:, 0] for w in windows])
+    cal_reach = np.concatenate([np.maximum.accumulate(w[:, 1]) for w in windows])
+
+    return {
+        "starts": starts,
+        "ends": ends,
+        "by_res": np.lexsort((starts, res)),
+        "res_bounds": np.searchsorted(np.sort(res), np.arange(num_res + 1)),
+        "cal_offsets": cal_offsets,
+        "cal_starts": cal_starts,
+        "cal_reach": cal_reach,
+        "curr_idx": rng.integers(-1, num_ops, 40),
+        "next_idx": rng.integers(-1, num_ops, 40),
+    }
+
+
+@pytest.mark.parametrize("loop, fallback, args", [
+    ("_overlap_candidates_loop", "_overlap_candidates_numpy",
+     ("starts", "ends", "by_res", "res_bounds")),
+    ("_overlap_pairs_loop", "_overlap_pairs_tree",
+     ("starts", "ends", "by_res", "res_bounds")),
+    ("_calendar_violations_loop", "_calendar_violations_numpy",
+     ("starts", "ends", "by_res", "res_bounds", "cal_offsets", "cal_starts", "cal_reach")),
+    ("_precedence_violations_loop", "_precedence_violations_numpy",
+     ("starts", "ends", "curr_idx", "next_idx")),
+])
+@pytest.mark.parametrize("seed", range(5))
+def test_loop_kernels_match_fallbacks(loop, fallback, args, seed):
+    """Test the loop kernels (compiled under numba) against the NumPy/tree fallbacks."""
+    import numpy as np
+    from src.validation import _kernels
+
+    inputs = _random_kernel_inputs(seed)
+    call_args = [inputs[name] for name in args]
+    got = getattr(_kernels, loop)(*call_args)
+    expected = getattr(_kernels, fallback)(*call_args)
+
+    # Pair order within a resource differs between the sweeps
+    if got.ndim == 2:
+        got, expected = np.unique(got, axis=0), np.unique(expected, axis=0)
+    assert got.dtype.kind == expected.dtype.kind
+    np.testing.assert_array_equal(got, expected)
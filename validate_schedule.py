@@ -9,31 +9,33 @@ Checks:
 4. KPIs are reproducible
 """
 
-import json
 import sys
 from src.models.cdm import ScheduleRequest, ScheduleResponse
 from src.validation.checkers import validate_schedule
 from src.validation.kpis import calculate_kpis
+from src.validation.arrays import prepare
+from src.utils.jsonio import load_json
 
 
 def validate_from_files(input_file: str, output_file: str) -> bool:
     """Validate a schedule against acceptance criteria."""
 
     # Load input and output
-    with open(input_file) as f:
-        input_data = json.load(f)
-
-    with open(output_file) as f:
-        output_data = json.load(f)
+    input_data = load_json(input_file)
+    output_data = load_json(output_file)
 
     request = ScheduleRequest(**input_data)
     response = ScheduleResponse(**output_data)
 
+    # Lookups and assignment arrays shared by the constraint checks and the
+    # KPI recalculation
+    context = prepare(request, response.assignments)
+
     print(f"Validating schedule with {len(response.assignments)} assignments...")
     print()
 
     # Check 1-3: Constraints
-    is_valid, errors = validate_schedule(request, response.assignments)
+    is_valid, errors = validate_schedule(request, response.assignments, context)
 
     if not is_valid:
         print("❌ VALIDATION FAILED")
@@ -47,7 +49,7 @@ def validate_from_files(input_file: str, output_file: str) -> bool:
     print("✓ Calendar/horizon compliance verified")
 
     # Check 4: KPI reproducibility
-    recalculated_kpis = calculate_kpis(request, response.assignments)
+    recalculated_kpis = calculate_kpis(request, response.assignments, context)
 
     tardiness_match = abs(recalculated_kpis.tardiness_minutes - response.kpis.tardiness_minutes) <= 1
     changeover_match = recalculated_kpis.changeovers == response.kpis.changeovers